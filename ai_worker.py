@@ -0,0 +1,36 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# One background thread is enough: only one computer player thinks at a time
+executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-worker")
+
+
+class BackgroundMove:
+    """Chooses a ComputerPlayer's move on a snapshot of its board in a worker thread.
+
+    The live board is never touched by the worker, so the UI can keep drawing
+    and handling events; apply the result with ComputerPlayer.execute_move once
+    done() is True.
+    """
+
+    def __init__(self, player):
+        self.player = player
+        self.stop_event = threading.Event()
+        self.cancelled = False
+        snapshot = player.board.copy()
+        self.future = executor.submit(player.choose_move, snapshot, self.stop_event)
+
+    def done(self):
+        return self.future.done()
+
+    def result(self):
+        """Returns the chosen move, or None if there was none or the search was cancelled."""
+        if self.cancelled:
+            return None
+        return self.future.result()
+
+    def cancel(self):
+        """Stops the search as soon as possible and discards its result."""
+        self.cancelled = True
+        self.stop_event.set()
+        self.future.cancel()
@@ -0,0 +1,94 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from board import TURN_ORDER
+from log_config import configure_logging, add_log_level_argument
+from saved_game import NAME_COLORS, build_board, case_number, color_to_move, load_saved_game
+from search import AlphaBetaSearch
+
+UNLIMITED_DEPTH = 64  # Search depth used when only the time limit should stop the search
+
+
+def analyze_file(task):
+    """Worker entry point: analyzes one saved game and returns a JSON-ready dict, or one with an error."""
+    path, color_name, search_depth, time_limit = task
+    start = time.perf_counter()
+    try:
+        saved = load_saved_game(path)
+    except (OSError, ValueError) as error:
+        return {'file': path, 'error': str(error)}
+
+    color = NAME_COLORS[color_name] if color_name else color_to_move(saved)
+    if color is None:
+        return {'file': path, 'error': "the file does not say whose turn it is; pass --color"}
+    board = build_board(saved)
+    moves = list(board.legal_moves(color))
+    colors = [c for c in TURN_ORDER if c in board.get_remaining_colors()]
+    winner = board.get_winner()
+
+    result = {
+        'file': path,
+        'board_size': saved.board_size,
+        'to_move': board.get_color_name(color),
+        'legal_moves': len(moves),
+        'captures': sum(1 for move in moves if move[2]),
+        'connectivity': {board.get_color_name(c): {'pieces': bin(board.color_masks[c]).count('1'),
+                                                   'groups': board.count_components(c),
+                                                   'connected': board.is_connected(c)} for c in colors},
+        'winner': board.get_color_name(winner) if winner is not None else None,
+        'best_move': None,
+    }
+    if moves and winner is None and (search_depth or time_limit):
+        search = AlphaBetaSearch(board, color, search_depth or UNLIMITED_DEPTH, time_limit)
+        best_move = search.search()
+        if best_move is not None:
+            result['best_move'] = (f"{board.get_position_notation(*best_move[0])} to "
+                                   f"{board.get_position_notation(*best_move[1])}")
+        result['search_depth'] = search.completed_depth
+        result['nodes'] = search.nodes
+    result['elapsed'] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def expand_paths(paths):
+    """Replaces each directory in paths with the .txt files inside it, in case order."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(glob.glob(os.path.join(path, '*.txt')), key=case_number)
+        else:
+            files.append(path)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze saved games without a window and print one JSON line per file.")
+    parser.add_argument('paths', nargs='+', help="Saved game files, or directories of them")
+    parser.add_argument('--depth', type=int, default=3,
+                        help="Alpha-beta search depth for the best move; 0 searches until --time-limit, "
+                             "or skips the search without one")
+    parser.add_argument('--time-limit', type=float, default=None, help="Seconds of search per position")
+    parser.add_argument('--color', choices=sorted(NAME_COLORS), help="Analyze for this color instead of the one to move")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help="Worker processes")
+    add_log_level_argument(parser)
+    args = parser.parse_args()
+    configure_logging(args.log_level)
+
+    tasks = [(path, args.color, args.depth, args.time_limit) for path in expand_paths(args.paths)]
+    failures = 0
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=configure_logging,
+                             initargs=(args.log_level,)) as executor:
+        # Results come back in input order, each printed as soon as it and those before it are done
+        for result in executor.map(analyze_file, tasks):
+            failures += 'error' in result
+            print(json.dumps(result), flush=True)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
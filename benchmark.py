@@ -0,0 +1,166 @@
+import argparse
+import itertools
+import json
+import platform
+import random
+import time
+import tracemalloc
+from board import Board, TURN_ORDER
+from computerPlayer import ComputerPlayer
+from headless import run_game, PLAYERS_FOR_SIZE
+
+POSITION_SEED = 1234  # Fixed so every run measures the same positions
+POSITION_PLIES = 12  # Random moves played from the start position before measuring
+PLAYOUT_SEEDS = 16  # Random games cycled through by the playout benchmark, so every run plays the same ones
+
+
+def seeded_position(board_size, plies=POSITION_PLIES, seed=POSITION_SEED):
+    """Returns a board after a fixed sequence of seeded random moves, and the color to move next."""
+    board = Board(board_size)
+    rng = random.Random(seed)
+    remaining_colors = board.get_remaining_colors()
+    colors = [color for color in TURN_ORDER if color in remaining_colors]
+    for ply in range(plies):
+        moves = list(board.legal_moves(colors[ply % len(colors)]))
+        board.make_move(rng.choice(moves))
+    return board, colors[plies % len(colors)]
+
+
+def bench_legal_moves(board, color):
+    return lambda: list(board.legal_moves(color))
+
+
+def bench_generate_all_possible_moves(board, color):
+    player = ComputerPlayer(board, color)
+    return player.generate_all_possible_moves
+
+
+def bench_is_valid_move(board, color):
+    pieces = board.get_pieces(color)
+
+    def check_every_square():
+        for piece in pieces:
+            for row in range(board.rows):
+                for col in range(board.cols):
+                    board.is_valid_move(piece, row, col)
+    return check_every_square
+
+
+def bench_count_diagonal_pieces(board, color):
+    pieces = board.get_pieces(color)
+
+    def count_diagonals():
+        for piece in pieces:
+            board.count_diagonal_pieces(piece.row, piece.col, piece.row + 1, piece.col + 1)
+            board.count_diagonal_pieces(piece.row, piece.col, piece.row + 1, piece.col - 1)
+    return count_diagonals
+
+
+def bench_connectivity(board, color):
+    colors = [c for c in TURN_ORDER if c in board.get_remaining_colors()]
+
+    def check_all_colors():
+        board.component_counts.clear()  # Measure the flood fill, not the cache
+        for c in colors:
+            board.is_connected(c)
+    return check_all_colors
+
+
+def bench_random_playout(board, color):
+    seeds = itertools.cycle(range(PLAYOUT_SEEDS))
+    return lambda: run_game(board.rows, seed=next(seeds))
+
+
+BENCHMARKS = {
+    'legal_moves': bench_legal_moves,
+    'generate_all_possible_moves': bench_generate_all_possible_moves,
+    'is_valid_move': bench_is_valid_move,
+    'count_diagonal_pieces': bench_count_diagonal_pieces,
+    'connectivity': bench_connectivity,
+    'random_playout': bench_random_playout,
+}
+
+
+def ops_per_second(operation, min_time):
+    """Calls operation in growing batches until min_time seconds have passed."""
+    calls = 0
+    batch = 1
+    start = time.perf_counter()
+    while True:
+        for _ in range(batch):
+            operation()
+        calls += batch
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls / elapsed
+        batch *= 2
+
+
+def allocations(operation, calls=5):
+    """Peak bytes allocated by one call and the number of blocks still held, measured with tracemalloc."""
+    tracemalloc.start()
+    try:
+        operation()  # Warm up caches so they are not counted
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        blocks_before = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+        for _ in range(calls):
+            operation()
+        _, peak = tracemalloc.get_traced_memory()
+        blocks_after = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    finally:
+        tracemalloc.stop()
+    return peak - baseline, blocks_after - blocks_before
+
+
+def run_benchmarks(sizes, names, min_time):
+    results = {}
+    for board_size in sizes:
+        for name in names:
+            board, color = seeded_position(board_size)
+            operation = BENCHMARKS[name](board, color)
+            peak_bytes, retained_blocks = allocations(operation)
+            results[f"{board_size}x{board_size}/{name}"] = {
+                'ops_per_sec': ops_per_second(operation, min_time),
+                'peak_bytes': peak_bytes,
+                'retained_blocks': retained_blocks,
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark board operations, move generation and win detection.")
+    parser.add_argument('--sizes', type=int, nargs='+', choices=sorted(PLAYERS_FOR_SIZE), default=sorted(PLAYERS_FOR_SIZE))
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+                        help="Benchmarks to run (default: all)")
+    parser.add_argument('--min-time', type=float, default=0.5, help="Seconds to time each benchmark")
+    parser.add_argument('--save', help="Write the results to this JSON baseline")
+    parser.add_argument('--compare', help="Compare against a JSON baseline written by --save")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.only, args.min_time)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+
+    print(f"{'benchmark':40} {'ops/sec':>12} {'peak KiB':>10} {'kept blocks':>12} {'vs baseline':>12}")
+    for name, result in results.items():
+        change = ''
+        if name in baseline:
+            change = f"{result['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1:+.1%}"
+        print(f"{name:40} {result['ops_per_sec']:12.1f} {result['peak_bytes'] / 1024:10.1f} "
+              f"{result['retained_blocks']:12} {change:>12}")
+
+    if args.save:
+        with open(args.save, 'w') as baseline_file:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'position_seed': POSITION_SEED,
+                'results': results,
+            }, baseline_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,25 @@
-import pygame
+import logging
+import random
 from piece import Piece
+from position import Position
+
+logger = logging.getLogger(__name__)
+
+# Move directions as (d_row, d_col): right, left, down, up, then the four diagonals
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)]
+
+# Colors in the order they take turns: Black always moves first, then White, Red and Green
+TURN_ORDER = [(0, 0, 0), (255, 255, 255), (255, 0, 0), (0, 255, 0)]
+
+# Zobrist keys for every (color, square) up to 16x16, plus one per color to move.
+# The generator is seeded so hashes are identical in every process and run.
+zobrist_random = random.Random(0x10A)
+ZOBRIST_KEYS = {color: [zobrist_random.getrandbits(64) for _ in range(256)] for color in TURN_ORDER}
+ZOBRIST_SIDE_KEYS = {color: zobrist_random.getrandbits(64) for color in TURN_ORDER}
 
 class Board:
+    background_cache = {}  # (size, window size) -> rendered empty board, shared by every Board
+
     def __init__(self, size, initialize=True):
         self.rows = size
         self.cols = size
@@ -10,10 +28,38 @@ class Board:
         self.grid_size = (self.window_size - self.offset * 2) // size  # Dynamically calculate grid size based on board size
         self.pieces = []  # List to hold the pieces
 
+        # Bitboard backend: square index is row * cols + col, one integer mask per color
+        self.squares = [None] * (size * size)  # Square index -> piece, for O(1) lookups
+        self.color_masks = {}  # Color -> bitboard of that color's pieces
+        self.occupied = 0  # Bitboard of every piece on the board
+        self.zobrist_hash = 0  # XOR of the Zobrist keys of every piece
+        self.component_counts = {}  # Color -> number of connected groups, dropped when that color changes
+        self.reset_line_counts()
+        self.undo_stack = []  # Tokens of moves played with make_move, most recent last
+
+        # Edge masks for shifting bitboards without wrapping around the board
+        self.full_mask = (1 << (size * size)) - 1
+        first_col_mask = sum(1 << (row * size) for row in range(size))
+        self.not_first_col_mask = self.full_mask & ~first_col_mask
+        self.not_last_col_mask = self.full_mask & ~(first_col_mask << (size - 1))
+
+        # Rendering cache: the last frame drawn and the state it shows
+        self.frame = None
+        self.drawn_colors = None
+        self.drawn_selection = None
+        self.drawn_hash = None
+
         if initialize:  # Only initialize pieces if the flag is True
             self.initialize_pieces(size)
 
 
+    def reset_line_counts(self):
+        """Zero the occupancy counters kept for every row, column, diagonal and anti-diagonal."""
+        self.row_counts = [0] * self.rows
+        self.col_counts = [0] * self.cols
+        self.diagonal_counts = [0] * (self.rows + self.cols - 1)  # Indexed by row - col + cols - 1
+        self.anti_diagonal_counts = [0] * (self.rows + self.cols - 1)  # Indexed by row + col
+
     def initialize_pieces(self, size):
         """Initialize pieces based on the number of players and board size."""
         if size == 8:
@@ -23,67 +69,178 @@ class Board:
 
     def initialize_2_player_pieces(self):
         for i in range(1, 7):
-            self.pieces.append(Piece(0, i, (0, 0, 0)))  # Top row (black)
-            self.pieces.append(Piece(7, i, (0, 0, 0)))  # Bottom row (black)
+            self.set_piece(0, i, (0, 0, 0))  # Top row (black)
+            self.set_piece(7, i, (0, 0, 0))  # Bottom row (black)
         for i in range(1, 7):
-            self.pieces.append(Piece(i, 0, (255, 255, 255)))  # Left column (white)
-            self.pieces.append(Piece(i, 7, (255, 255, 255)))  # Right column (white)
+            self.set_piece(i, 0, (255, 255, 255))  # Left column (white)
+            self.set_piece(i, 7, (255, 255, 255))  # Right column (white)
 
     def initialize_4_player_pieces(self, size):
         empty_spaces = (size - 6) // 2
         for i in range(6):
             col_position = empty_spaces + i
             color = (0, 0, 0) if i % 2 == 0 else (255, 0, 0)  # Black (B) and Red (R)
-            self.pieces.append(Piece(0, col_position, color))  # Top row
-            self.pieces.append(Piece(size - 1, col_position, color))  # Bottom row
+            self.set_piece(0, col_position, color)  # Top row
+            self.set_piece(size - 1, col_position, color)  # Bottom row
         for i in range(6):
             row_position = empty_spaces + i
             color = (255, 255, 255) if i % 2 == 0 else (0, 255, 0)  # White (W) and Green (G)
-            self.pieces.append(Piece(row_position, 0, color))  # Left column
-            self.pieces.append(Piece(row_position, size - 1, color))  # Right column
+            self.set_piece(row_position, 0, color)  # Left column
+            self.set_piece(row_position, size - 1, color)  # Right column
 
     def draw(self, window, selected_piece=None):
-        tan_color = (210, 180, 140)
-        font = pygame.font.SysFont('Arial', 24)
-        for row in range(self.rows):
+        """Blits the board onto the window, repainting only squares that changed since the last draw."""
+        if self.frame is None:
+            self.frame = self.get_background().copy()
+            self.drawn_colors = [None] * (self.rows * self.cols)
+            self.drawn_selection = None
+            self.drawn_hash = self.zobrist_hash ^ 1  # Force the first comparison below
+
+        selection = (selected_piece.row, selected_piece.col) if selected_piece else None
+        if self.zobrist_hash != self.drawn_hash or selection != self.drawn_selection:
+            dirty_squares = set()
+            for square, piece in enumerate(self.squares):
+                color = piece.color if piece else None
+                if color != self.drawn_colors[square]:
+                    dirty_squares.add(square)
+                    self.drawn_colors[square] = color
+            for row_col in (self.drawn_selection, selection):
+                if row_col:
+                    dirty_squares.add(row_col[0] * self.cols + row_col[1])
+            for square in dirty_squares:
+                self.draw_square(square, selected_piece)
+            self.drawn_hash = self.zobrist_hash
+            self.drawn_selection = selection
+
+        window.blit(self.frame, (0, 0))
+
+    def draw_square(self, square, selected_piece):
+        """Repaints one square of the cached frame from the background, then its piece."""
+        import pygame  # Imported here so headless code can use Board without pygame
+        row, col = divmod(square, self.cols)
+        rect = pygame.Rect(col * self.grid_size + self.offset, row * self.grid_size + self.offset, self.grid_size, self.grid_size)
+        self.frame.blit(self.get_background(), rect, rect)
+        piece = self.squares[square]
+        if piece:
+            if piece == selected_piece:
+                self.outline_piece(self.frame, piece)
+            piece.draw(self.frame, self.grid_size, self.offset)
+
+    def get_background(self):
+        """Returns the empty grid with its coordinate labels, rendered once per board size."""
+        key = (self.rows, self.window_size)
+        background = Board.background_cache.get(key)
+        if background is None:
+            import pygame
+            from fonts import render_text
+            background = pygame.Surface((self.window_size, self.window_size))
+            background.fill((255, 255, 255))
+            tan_color = (210, 180, 140)
+            for row in range(self.rows):
+                for col in range(self.cols):
+                    rect = pygame.Rect(col * self.grid_size + self.offset, row * self.grid_size + self.offset, self.grid_size, self.grid_size)
+                    pygame.draw.rect(background, tan_color, rect)
+                    pygame.draw.rect(background, (0, 0, 0), rect, 1)
             for col in range(self.cols):
-                rect = pygame.Rect(col * self.grid_size + self.offset, row * self.grid_size + self.offset, self.grid_size, self.grid_size)
-                pygame.draw.rect(window, tan_color, rect)
-                pygame.draw.rect(window, (0, 0, 0), rect, 1)
-                piece = self.get_piece(row, col)
-                if piece:
-                    if piece == selected_piece:
-                        self.outline_piece(window, piece)
-                    piece.draw(window, self.grid_size, self.offset)
-        for col in range(self.cols):
-            label = font.render(chr(65 + col), True, (0, 0, 0))
-            label_rect = label.get_rect(center=(col * self.grid_size + self.offset + self.grid_size // 2, self.rows * self.grid_size + self.offset + 20))
-            window.blit(label, label_rect)
-        for row in range(self.rows):
-            label = font.render(str(self.rows - row), True, (0, 0, 0))
-            label_rect = label.get_rect(center=(self.offset - 20, row * self.grid_size + self.offset + self.grid_size // 2))
-            window.blit(label, label_rect)
+                label = render_text(chr(65 + col), 24, (0, 0, 0))
+                label_rect = label.get_rect(center=(col * self.grid_size + self.offset + self.grid_size // 2, self.rows * self.grid_size + self.offset + 20))
+                background.blit(label, label_rect)
+            for row in range(self.rows):
+                label = render_text(str(self.rows - row), 24, (0, 0, 0))
+                label_rect = label.get_rect(center=(self.offset - 20, row * self.grid_size + self.offset + self.grid_size // 2))
+                background.blit(label, label_rect)
+            Board.background_cache[key] = background
+        return background
 
     def outline_piece(self, window, piece):
+        import pygame
         outline_color = (255, 215, 0)
         outline_rect = pygame.Rect(piece.col * self.grid_size + self.offset, piece.row * self.grid_size + self.offset, self.grid_size, self.grid_size)
         pygame.draw.rect(window, outline_color, outline_rect, 5)
 
     def get_piece(self, row, col):
-        for piece in self.pieces:
-            if piece.row == row and piece.col == col:
-                return piece
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self.squares[row * self.cols + col]
         return None
 
+    def place_on_bitboards(self, piece):
+        """Record a piece in the square table and bitboards."""
+        square = piece.row * self.cols + piece.col
+        bit = 1 << square
+        self.squares[square] = piece
+        self.occupied |= bit
+        self.color_masks[piece.color] = self.color_masks.get(piece.color, 0) | bit
+        self.zobrist_hash ^= ZOBRIST_KEYS[piece.color][square]
+        self.component_counts.pop(piece.color, None)
+        self.row_counts[piece.row] += 1
+        self.col_counts[piece.col] += 1
+        self.diagonal_counts[piece.row - piece.col + self.cols - 1] += 1
+        self.anti_diagonal_counts[piece.row + piece.col] += 1
+
+    def lift_from_bitboards(self, piece):
+        """Clear a piece from the square table and bitboards."""
+        square = piece.row * self.cols + piece.col
+        bit = 1 << square
+        self.squares[square] = None
+        self.occupied &= ~bit
+        self.color_masks[piece.color] &= ~bit
+        self.zobrist_hash ^= ZOBRIST_KEYS[piece.color][square]
+        self.component_counts.pop(piece.color, None)
+        self.row_counts[piece.row] -= 1
+        self.col_counts[piece.col] -= 1
+        self.diagonal_counts[piece.row - piece.col + self.cols - 1] -= 1
+        self.anti_diagonal_counts[piece.row + piece.col] -= 1
+
     def remove_piece(self, piece):
         self.pieces.remove(piece)
+        self.lift_from_bitboards(piece)
 
     def move_piece(self, piece, row, col):
         target_piece = self.get_piece(row, col)
         if target_piece and target_piece.color != piece.color:
             self.remove_piece(target_piece)
+        self.lift_from_bitboards(piece)
         piece.row = row
         piece.col = col
+        self.place_on_bitboards(piece)
+
+    def position_key(self, color_to_move):
+        """Zobrist key of the current position with the given color to move."""
+        return self.zobrist_hash ^ ZOBRIST_SIDE_KEYS[color_to_move]
+
+    def make_move(self, move):
+        """Plays a legal (start, end[, is_capture]) move and returns the token that undoes it."""
+        (start_row, start_col), (end_row, end_col) = move[0], move[1]
+        piece = self.squares[start_row * self.cols + start_col]
+        captured_piece = self.squares[end_row * self.cols + end_col]
+        component_counts = dict(self.component_counts)
+        captured_index = None
+        if captured_piece:
+            captured_index = self.pieces.index(captured_piece)
+            del self.pieces[captured_index]
+            self.lift_from_bitboards(captured_piece)
+        self.lift_from_bitboards(piece)
+        piece.row = end_row
+        piece.col = end_col
+        self.place_on_bitboards(piece)
+        token = (piece, start_row, start_col, captured_piece, captured_index, component_counts)
+        self.undo_stack.append(token)
+        return token
+
+    def unmake_move(self, token):
+        """Takes back the most recent make_move, restoring any captured piece exactly."""
+        if not self.undo_stack or self.undo_stack[-1] is not token:
+            raise ValueError("Moves must be unmade in the reverse order they were made.")
+        self.undo_stack.pop()
+        piece, start_row, start_col, captured_piece, captured_index, component_counts = token
+        self.lift_from_bitboards(piece)
+        piece.row = start_row
+        piece.col = start_col
+        self.place_on_bitboards(piece)
+        if captured_piece:
+            self.pieces.insert(captured_index, captured_piece)  # Same list position as before the capture
+            self.place_on_bitboards(captured_piece)
+        self.component_counts = component_counts
 
     def is_valid_move(self, piece, row, col):
         if not (0 <= row < self.rows and 0 <= col < self.cols):
@@ -111,49 +268,63 @@ class Board:
             return False, f"Invalid move distance: Attempted {distance}, but required {line_pieces}."
         return True, ""
 
+    def legal_moves(self, color):
+        """Yields each legal (start, end, is_capture) move for a color, at most one per direction."""
+        own = self.color_masks.get(color, 0)
+        opponents = self.occupied & ~own
+        rows, cols = self.rows, self.cols
+        remaining = own
+        while remaining:
+            low_bit = remaining & -remaining
+            remaining ^= low_bit
+            square = low_bit.bit_length() - 1
+            row, col = divmod(square, cols)
+            for d_row, d_col in DIRECTIONS:
+                # The only candidate target is exactly line_count squares away
+                distance = self.line_count(row, col, d_row, d_col)
+                end_row = row + d_row * distance
+                end_col = col + d_col * distance
+                if not (0 <= end_row < rows and 0 <= end_col < cols):
+                    continue
+                end = end_row * cols + end_col
+                if own >> end & 1:
+                    continue
+                step = d_row * cols + d_col
+                for between in range(square + step, end, step):
+                    if opponents >> between & 1:
+                        break
+                else:
+                    yield (row, col), (end_row, end_col), bool(opponents >> end & 1)
+
     def is_path_clear(self, start_row, start_col, end_row, end_col, color):
         d_row = (end_row - start_row) // max(1, abs(end_row - start_row))
         d_col = (end_col - start_col) // max(1, abs(end_col - start_col))
-        current_row = start_row + d_row
-        current_col = start_col + d_col
-        while current_row != end_row or current_col != end_col:
-            piece = self.get_piece(current_row, current_col)
-            if piece:
-                if piece.color != color:
-                    return False
-            current_row += d_row
-            current_col += d_col
+        opponents = self.occupied & ~self.color_masks.get(color, 0)
+        step = d_row * self.cols + d_col
+        square = start_row * self.cols + start_col
+        for _ in range(max(abs(end_row - start_row), abs(end_col - start_col)) - 1):
+            square += step
+            if opponents >> square & 1:
+                return False
         return True
 
     def count_diagonal_pieces(self, start_row, start_col, end_row, end_col):
-        count = 0
         d_row = 1 if end_row > start_row else -1
         d_col = 1 if end_col > start_col else -1
-        row, col = start_row, start_col
-        while row >= 0 and row < self.rows and col >= 0 and col < self.cols:
-            if self.get_piece(row, col):
-                count += 1
-            row -= d_row
-            col -= d_col
-        row, col = start_row + d_row, start_col + d_col
-        while row >= 0 and row < self.rows and col >= 0 and col < self.cols:
-            if self.get_piece(row, col):
-                count += 1
-            row += d_row
-            col += d_col
-        return count
+        return self.line_count(start_row, start_col, d_row, d_col)
 
     def count_pieces_on_line(self, index, is_row=True):
-        count = 0
-        if is_row:
-            for col in range(self.cols):
-                if self.get_piece(index, col):
-                    count += 1
-        else:
-            for row in range(self.rows):
-                if self.get_piece(row, index):
-                    count += 1
-        return count
+        return self.row_counts[index] if is_row else self.col_counts[index]
+
+    def line_count(self, row, col, d_row, d_col):
+        """Number of pieces on the line through (row, col) in direction (d_row, d_col)."""
+        if d_row == 0:
+            return self.row_counts[row]
+        if d_col == 0:
+            return self.col_counts[col]
+        if d_row == d_col:
+            return self.diagonal_counts[row - col + self.cols - 1]
+        return self.anti_diagonal_counts[row + col]
 
     def get_position_notation(self, row, col):
         column_label = chr(65 + col)
@@ -162,23 +333,14 @@ class Board:
 
     def get_remaining_colors(self):
         """Returns a set of remaining colors on the board."""
-        remaining_colors = set()
-        for piece in self.pieces:
-            remaining_colors.add(piece.color)
-        return remaining_colors
-
-    def get_remaining_colors(self):
-        """Returns a set of remaining colors on the board."""
-        remaining_colors = set()
-        for piece in self.pieces:
-            remaining_colors.add(piece.color)
-        return remaining_colors
+        return {color for color, mask in self.color_masks.items() if mask}
 
     def check_connected_group(self, color):
         """Check if all pieces of a specified color are connected, or if only one color remains on the board."""
         #print(f"Color is: {color}")
         # Debugging: Display current pieces on the board
-        print(f"Checking connected group for color: {self.get_color_name(color)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Checking connected group for color: %s", self.get_color_name(color))
         #print(f"Current pieces on the board: {[f'({piece.row}, {piece.col}, {self.get_color_name(piece.color)})' for piece in self.pieces]}")
 
         # Check if only one color remains on the board
@@ -186,57 +348,60 @@ class Board:
         #print(f"Remaining colors on board: {[self.get_color_name(c) for c in remaining_colors]}")  # Debugging statement
 
         if len(remaining_colors) == 1:
-            print("Only one color remains on the board, automatic winner.")
+            logger.debug("Only one color remains on the board, automatic winner.")
             return True
 
-        # Proceed with the regular check for connected groups
-        start_row, start_col = -1, -1
-        visited = [[False for _ in range(self.cols)] for _ in range(self.rows)]
-
-        # Find the starting piece of the given color
-        for row in range(self.rows):
-            for col in range(self.cols):
-                piece = self.get_piece(row, col)
-                if piece and piece.color == color:
-                    start_row, start_col = row, col
-                    break
-            if start_row != -1:
-                break
-
-        # If no starting piece was found, return False
-        if start_row == -1:
-            print("No starting piece found for this color.")
+        # If no piece of this color is on the board, it cannot be connected
+        if not self.color_masks.get(color, 0):
+            logger.debug("No starting piece found for this color.")
             return False
 
-        #print(f"Starting DFS from piece at ({start_row}, {start_col}) for color {self.get_color_name(color)}")  # Debugging
+        # The component count is cached and only recomputed after the color's pieces change
+        if not self.is_connected(color):
+            return False
 
-        # Start DFS from the first found piece
-        self.dfs(start_row, start_col, color, visited)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("All pieces of color %s are connected.", self.get_color_name(color))
+        return True
 
-        # Check if all pieces of the color are visited
-        for row in range(self.rows):
-            for col in range(self.cols):
-                piece = self.get_piece(row, col)
-                if piece and piece.color == color and not visited[row][col]:
-                    return False
+    def spread(self, mask):
+        """Returns the bitboard of mask plus every square touching it, diagonals included."""
+        horizontal = mask | ((mask << 1) & self.not_first_col_mask) | ((mask >> 1) & self.not_last_col_mask)
+        return (horizontal | (horizontal << self.cols) | (horizontal >> self.cols)) & self.full_mask
+
+    def count_components(self, color):
+        """Returns the number of separate 8-connected groups a color has, cached until its pieces change."""
+        count = self.component_counts.get(color)
+        if count is None:
+            count = 0
+            remaining = self.color_masks.get(color, 0)
+            while remaining:
+                group = remaining & -remaining  # Flood fill outwards from the lowest piece left
+                while True:
+                    grown = self.spread(group) & remaining
+                    if grown == group:
+                        break
+                    group = grown
+                remaining &= ~group
+                count += 1
+            self.component_counts[color] = count
+        return count
 
-        print(f"All pieces of color {self.get_color_name(color)} are connected.")
-        return True
+    def is_connected(self, color):
+        """Checks whether every piece of a color forms one group."""
+        return self.count_components(color) == 1
 
-    def dfs(self, row, col, color, visited):
-        row_nbr = [-1, 1, 0, 0, -1, -1, 1, 1]
-        col_nbr = [0, 0, -1, 1, -1, 1, -1, 1]
-        visited[row][col] = True
-        for k in range(8):
-            new_row = row + row_nbr[k]
-            new_col = col + col_nbr[k]
-            if self.is_safe(new_row, new_col, color, visited):
-                self.dfs(new_row, new_col, color, visited)
-
-    def is_safe(self, row, col, color, visited):
-        return (0 <= row < self.rows) and (0 <= col < self.cols) and \
-               self.get_piece(row, col) and self.get_piece(row, col).color == color and \
-               not visited[row][col]
+    def get_winner(self, last_mover=None):
+        """Returns the winning color after last_mover's move, or None if the game goes on."""
+        remaining_colors = self.get_remaining_colors()
+        if len(remaining_colors) == 1:
+            return next(iter(remaining_colors))
+        if last_mover is not None and self.is_connected(last_mover):
+            return last_mover  # The player who just moved wins if both groups connect
+        for color in TURN_ORDER:
+            if color != last_mover and color in remaining_colors and self.is_connected(color):
+                return color
+        return None
 
     def get_color_name(self, color):
         """Convert an RGB color tuple to a string representing the color name."""
@@ -254,13 +419,50 @@ class Board:
     def clear_board(self):
         """Clears all pieces from the board."""
         self.pieces.clear()  # Clears all elements in the pieces list
+        self.squares = [None] * (self.rows * self.cols)
+        self.color_masks = {}
+        self.occupied = 0
+        self.zobrist_hash = 0
+        self.component_counts = {}
+        self.reset_line_counts()
+        self.undo_stack = []
 
     def set_piece(self, row, col, color):
         """Places a piece at the specified position on the board."""
         #print(f"Setting piece at ({row}, {col}) with color {color}")  # Debugging statement
-        self.pieces.append(Piece(row, col, color))  # Add piece to the list
+        existing_piece = self.get_piece(row, col)
+        if existing_piece:
+            self.remove_piece(existing_piece)  # A square holds at most one piece
+        piece = Piece(row, col, color)
+        self.pieces.append(piece)  # Add piece to the list
+        self.place_on_bitboards(piece)
         #print(f"Current pieces on board: {[f'({p.row}, {p.col}, {p.color})' for p in self.pieces]}")  # Debugging statement
 
+    def copy(self):
+        """Returns an independent board with the same pieces, e.g. as a snapshot for a worker thread."""
+        board = Board(self.rows, initialize=False)
+        for piece in self.pieces:
+            board.set_piece(piece.row, piece.col, piece.color)
+        return board
+
+    def to_position(self, color_to_move=None):
+        """Returns a compact Position of this board, optionally recording whose turn it is."""
+        masks = tuple(self.color_masks.get(color, 0) for color in TURN_ORDER)
+        to_move = TURN_ORDER.index(color_to_move) if color_to_move is not None else None
+        return Position(self.rows, masks, to_move)
+
+    @classmethod
+    def from_position(cls, position):
+        """Builds a board holding the pieces of a Position."""
+        board = cls(position.size, initialize=False)
+        for color, mask in zip(TURN_ORDER, position.masks):
+            while mask:
+                low_bit = mask & -mask
+                mask ^= low_bit
+                row, col = divmod(low_bit.bit_length() - 1, position.size)
+                board.set_piece(row, col, color)
+        return board
+
     def get_pieces(self, color):
         """Returns a list of all pieces of a given color on the board."""
         return [piece for piece in self.pieces if piece.color == color]
@@ -1,5 +1,13 @@
+import logging
 import random
 from board import Board
+from mcts import MCTSSearch, root_parallel_search
+from opening_book import load_book
+from search import AlphaBetaSearch
+from tablebase import load_tablebase
+from transposition import TranspositionTable
+
+logger = logging.getLogger(__name__)
 
 # Mapping of index to column notation (A-H)
 index_to_col = {
@@ -7,10 +15,34 @@ index_to_col = {
     4: 'E', 5: 'F', 6: 'G', 7: 'H'
 }
 
+# Move selection strategies a ComputerPlayer can use
+ENGINES = ("random", "alphabeta", "mcts")
+
 class ComputerPlayer:
-    def __init__(self, board, color=(255, 255, 255)):  # Add color as an argument with default white
+    def __init__(self, board, color=(255, 255, 255), engine="random", search_depth=3, time_limit=None,
+                 node_limit=None, transposition_table_size=1 << 16, playouts=1000, heuristic_playouts=True,
+                 workers=1, book_path=None, tablebase_path=None, rng=None):  # Add color as an argument with default white
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
         self.board = board
         self.color = color  # Use the passed color
+        self.engine = engine  # "random" plays a random move, "alphabeta" and "mcts" search
+        self.search_depth = search_depth  # Deepest iteration of the alpha-beta search
+        self.time_limit = time_limit  # Seconds the search may use per move, or None
+        self.node_limit = node_limit  # Nodes the search may visit per move, or None
+        self.transposition_table = None
+        if engine == "alphabeta":
+            # Kept across turns so later searches reuse earlier results; fixed size bounds memory
+            self.transposition_table = TranspositionTable(transposition_table_size)
+        self.playouts = playouts  # MCTS playouts per move, or None to use only the time limit
+        self.heuristic_playouts = heuristic_playouts  # MCTS playouts prefer captures and compact moves
+        self.workers = workers  # MCTS processes searching in parallel; 1 searches in this process
+        # Searching engines play a book move instead of searching whenever the book has one
+        self.opening_book = load_book(book_path) if book_path is not None else None
+        # Every engine, random included, plays the tablebase move in endgames the tables cover
+        self.tablebase = load_tablebase(tablebase_path, board.rows) if tablebase_path is not None else None
+        self.rng = rng if rng is not None else random  # Pass a seeded random.Random for reproducible games
+        self.last_search = None  # Most recent search, kept for its statistics and the MCTS tree
         self.possible_moves = []
         self.capture_moves = []  # Store capture moves separately
 
@@ -24,97 +56,51 @@ class ComputerPlayer:
     def generate_all_possible_moves(self):
         self.possible_moves.clear()
         self.capture_moves.clear()  # Clear the capture moves list
-        print(f"Generating moves for color: {self.color}")  # Debugging
-
-        # Iterate through all pieces on the board
-        for row in range(self.board.rows):
-            for col in range(self.board.cols):
-                piece = self.board.get_piece(row, col)
-
-                if piece:  # Only proceed if a piece exists
-                    print(f"Found piece at {self.proper_notation((col, row))} with color {piece.color}")  # Debugging
-
-                    # Check if the piece matches the AI's color
-                    if piece.color == self.color:
-                        self.generate_moves_for_piece(row, col)
-
-        print(f"Total possible moves generated: {len(self.possible_moves)}")  # Debugging
-        print(f"Total capture moves generated: {len(self.capture_moves)}")  # Debugging
-        self.display_generated_moves()  # Display all generated moves
-
-    def generate_moves_for_piece(self, start_row, start_col):
-        # Horizontal moves
-        horizontal_moves_required = self.board.count_pieces_on_line(start_row, is_row=True)
-        for offset in range(1, horizontal_moves_required + 1):
-            self.add_move_if_valid(start_row, start_col, start_row, start_col + offset)  # Right
-            self.add_move_if_valid(start_row, start_col, start_row, start_col - offset)  # Left
-
-        # Vertical moves
-        vertical_moves_required = self.board.count_pieces_on_line(start_col, is_row=False)
-        for offset in range(1, vertical_moves_required + 1):
-            self.add_move_if_valid(start_row, start_col, start_row + offset, start_col)  # Down
-            self.add_move_if_valid(start_row, start_col, start_row - offset, start_col)  # Up
-
-        # Diagonal moves
-        diagonal_moves_required = self.board.count_diagonal_pieces(start_row, start_col, start_row, start_col)
-        for offset in range(1, diagonal_moves_required + 1):
-            self.add_move_if_valid(start_row, start_col, start_row + offset, start_col + offset)  # Bottom-right
-            self.add_move_if_valid(start_row, start_col, start_row - offset, start_col - offset)  # Top-left
-            self.add_move_if_valid(start_row, start_col, start_row + offset, start_col - offset)  # Bottom-left
-            self.add_move_if_valid(start_row, start_col, start_row - offset, start_col + offset)  # Top-right
-
-    def add_move_if_valid(self, start_row, start_col, end_row, end_col):
-        if 0 <= end_row < self.board.rows and 0 <= end_col < self.board.cols:
-            is_valid, captures = self.validate_move(start_row, start_col, end_row, end_col)
-            if is_valid:
-                move_details = {
-                    'start': (start_row, start_col),
-                    'end': (end_row, end_col),
-                    'captures': captures
-                }
-                # Add the move to capture_moves if it results in a capture, otherwise to possible_moves
-                if captures:
-                    self.capture_moves.append(move_details)
-                else:
-                    self.possible_moves.append(move_details)
-                print(
-                    f"Valid move found: {self.proper_notation((start_col, start_row))} to {self.proper_notation((end_col, end_row))}")  # Debugging
-
-    def validate_move(self, start_row, start_col, end_row, end_col):
-        captures = []
-        piece = self.board.get_piece(start_row, start_col)
-        if not piece or piece.color != self.color:  # Only validate for pieces controlled by AI
-            return False, captures
-
-        is_valid, message = self.board.is_valid_move(piece, end_row, end_col)
-        if is_valid:
-            target_piece = self.board.get_piece(end_row, end_col)
-            if target_piece and target_piece.color != self.color:
-                captures.append((end_row, end_col))
-            return True, captures
-
-        return False, captures
+        debug = logger.isEnabledFor(logging.DEBUG)  # Skip building notation strings when nobody reads them
+        logger.debug("Generating moves for color: %s", self.color)
+
+        # The board yields each legal move exactly once
+        for start, end, is_capture in self.board.legal_moves(self.color):
+            move_details = {
+                'start': start,
+                'end': end,
+                'captures': [end] if is_capture else []
+            }
+            # Add the move to capture_moves if it results in a capture, otherwise to possible_moves
+            if is_capture:
+                self.capture_moves.append(move_details)
+            else:
+                self.possible_moves.append(move_details)
+            if debug:
+                logger.debug("Valid move found: %s to %s", self.proper_notation((start[1], start[0])),
+                             self.proper_notation((end[1], end[0])))
+
+        if debug:
+            logger.debug("Total possible moves generated: %s", len(self.possible_moves))
+            logger.debug("Total capture moves generated: %s", len(self.capture_moves))
+            self.display_generated_moves()  # Display all generated moves
 
     def select_and_execute_move(self):
         if not self.capture_moves and not self.possible_moves:
-            print("No possible moves to select from.")  # Debugging
+            logger.debug("No possible moves to select from.")
             return None  # No move was executed
 
         # Prioritize capture moves if available
         if self.capture_moves:
-            selected_move = random.choice(self.capture_moves)
+            selected_move = self.rng.choice(self.capture_moves)
         else:
-            selected_move = random.choice(self.possible_moves)
+            selected_move = self.rng.choice(self.possible_moves)
 
         start = selected_move['start']
         end = selected_move['end']
-        start_notation = self.proper_notation((start[1], start[0]))
-        end_notation = self.proper_notation((end[1], end[0]))
+        debug = logger.isEnabledFor(logging.DEBUG)  # Every random player's move comes through here
+        if debug:
+            start_notation = self.proper_notation((start[1], start[0]))
+            end_notation = self.proper_notation((end[1], end[0]))
+            logger.debug("Selected move: %s to %s", start_notation, end_notation)
 
         piece = self.board.get_piece(start[0], start[1])
 
-        print(f"Selected move: {start_notation} to {end_notation}")  # Debugging
-
         # If the move is valid
         if piece and self.board.is_valid_move(piece, end[0], end[1])[0]:
 
@@ -124,45 +110,121 @@ class ComputerPlayer:
                     captured_piece = self.board.get_piece(capture[0], capture[1])
                     if captured_piece:
                         self.board.remove_piece(captured_piece)
-                        print(f"Captured piece at {self.proper_notation((capture[1], capture[0]))}")  # Debugging
+                        if debug:
+                            logger.debug("Captured piece at %s", self.proper_notation((capture[1], capture[0])))
 
             # After handling captures, move the piece to its new position
             self.board.move_piece(piece, end[0], end[1])
-            print(f"AI moved from {start_notation} to {end_notation}")  # Debugging
+            if debug:
+                logger.debug("AI moved from %s to %s", start_notation, end_notation)
 
             # Return the move details for recording in move history
             return start[0], start[1], end[0], end[1]
 
         else:
-            print(f"Failed to execute move: {start_notation} to {end_notation}")  # Debugging
+            if debug:
+                logger.debug("Failed to execute move: %s to %s", start_notation, end_notation)
             return None  # No move was executed
 
+    def choose_move(self, board=None, stop_event=None):
+        """Picks a (start, end, is_capture) move on board (default: own board) without playing it.
+
+        Safe to run on a board copy in another thread; setting stop_event cuts a search short.
+        """
+        board = board if board is not None else self.board
+        if self.tablebase is not None:
+            tablebase_move = self.tablebase.best_move(board, self.color)
+            if tablebase_move is not None:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Tablebase move from %s to %s", self.proper_notation((tablebase_move[0][1], tablebase_move[0][0])),
+                                 self.proper_notation((tablebase_move[1][1], tablebase_move[1][0])))
+                self.last_search = None
+                return tablebase_move
+        if self.opening_book is not None and self.engine != "random":
+            book_move = self.opening_book.book_move(board, self.color)
+            if book_move is not None:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Book move from %s to %s", self.proper_notation((book_move[0][1], book_move[0][0])),
+                                 self.proper_notation((book_move[1][1], book_move[1][0])))
+                self.last_search = None
+                return book_move
+        if self.engine == "alphabeta":
+            search = AlphaBetaSearch(board, self.color, self.search_depth, self.time_limit, self.node_limit,
+                                     self.transposition_table, stop_event)
+            self.last_search = search
+            return search.search()
+        if self.engine == "mcts":
+            if self.workers > 1:
+                return root_parallel_search(board, self.color, self.workers, self.playouts, self.time_limit,
+                                            rng=self.rng, stop_event=stop_event,
+                                            heuristic_playouts=self.heuristic_playouts)
+            search = MCTSSearch(board, self.color, self.playouts, self.time_limit,
+                                heuristic_playouts=self.heuristic_playouts, rng=self.rng, stop_event=stop_event,
+                                reuse=self.last_search)
+            self.last_search = search
+            return search.search()
+
+        moves = list(board.legal_moves(self.color))
+        capture_moves = [move for move in moves if move[2]]  # Prioritize capture moves if available
+        if capture_moves:
+            return self.rng.choice(capture_moves)
+        return self.rng.choice(moves) if moves else None
+
+    def execute_move(self, move):
+        """Plays a move chosen by choose_move on the player's board and returns it for the move history."""
+        start, end = move[0], move[1]
+        piece = self.board.get_piece(start[0], start[1])
+        self.board.move_piece(piece, end[0], end[1])
+        return start[0], start[1], end[0], end[1]
+
+    def search_and_execute_move(self):
+        """Plays the best move found by the alpha-beta or MCTS search within the configured budget."""
+        best_move = self.choose_move()
+        if best_move is None:
+            logger.debug("No possible moves to select from.")
+            return None
+
+        if logger.isEnabledFor(logging.DEBUG) and self.last_search is not None:
+            start, end = best_move[0], best_move[1]
+            if self.engine == "alphabeta":
+                logger.debug("Search chose %s to %s at depth %s after %s nodes",
+                             self.proper_notation((start[1], start[0])), self.proper_notation((end[1], end[0])),
+                             self.last_search.completed_depth, self.last_search.nodes)
+            elif self.engine == "mcts":
+                logger.debug("MCTS chose %s to %s after %s playouts (%s reused)",
+                             self.proper_notation((start[1], start[0])), self.proper_notation((end[1], end[0])),
+                             self.last_search.completed_playouts, self.last_search.reused_visits)
+        return self.execute_move(best_move)
+
     def make_move(self):
-        print("AI is attempting to make a move...")  # Debugging
-        self.generate_all_possible_moves()
-        move = self.select_and_execute_move()
+        logger.debug("AI is attempting to make a move...")
+        if self.engine != "random" or self.tablebase is not None:
+            move = self.search_and_execute_move()
+        else:
+            self.generate_all_possible_moves()
+            move = self.select_and_execute_move()
 
         if move is None:
-            print("AI could not find a valid move.")
+            logger.debug("AI could not find a valid move.")
             return None  # Return None if no move was executed
 
         return move  # Return the move details for history tracking
 
     def display_generated_moves(self):
         """Displays all generated moves for debugging."""
-        print("Displaying all generated moves:")
+        logger.debug("Displaying all generated moves:")
         if not self.possible_moves and not self.capture_moves:
-            print("No moves were generated.")
+            logger.debug("No moves were generated.")
             return
 
-        print("\nPossible Moves:")
+        logger.debug("Possible Moves:")
         for move in self.possible_moves:
             start = self.proper_notation((move['start'][1], move['start'][0]))
             end = self.proper_notation((move['end'][1], move['end'][0]))
-            print(f"Move from {start} to {end}")
+            logger.debug("Move from %s to %s", start, end)
 
-        print("\nCapture Moves:")
+        logger.debug("Capture Moves:")
         for move in self.capture_moves:
             start = self.proper_notation((move['start'][1], move['start'][0]))
             end = self.proper_notation((move['end'][1], move['end'][0]))
-            print(f"Move from {start} to {end} (Capture)")
+            logger.debug("Move from %s to %s (Capture)", start, end)
@@ -0,0 +1,239 @@
+import numpy as np
+from board import DIRECTIONS
+
+# Feature weights of the static score; concentration, components and Euler number count against a color
+WEIGHTS = {
+    'centralization': 1.0,
+    'concentration': -2.0,
+    'euler': -1.0,
+    'mobility': 0.05,
+    'components': -1.5,
+}
+
+
+def positions_to_grids(positions):
+    """Stacks same-size Positions into an (N, size, size) int8 array of 0 for empty or 1 + TURN_ORDER index."""
+    size = positions[0].size
+    squares = size * size
+    num_bytes = (squares + 7) // 8
+    grids = np.zeros((len(positions), squares), dtype=np.int8)
+    for index, position in enumerate(positions):
+        if position.size != size:
+            raise ValueError("All positions in a grid batch must have the same board size.")
+        for color_index, mask in enumerate(position.masks):
+            if mask:
+                bits = np.unpackbits(np.frombuffer(mask.to_bytes(num_bytes, 'little'), dtype=np.uint8),
+                                     bitorder='little')[:squares]
+                grids[index][bits.astype(bool)] = color_index + 1
+    return grids.reshape(len(positions), size, size)
+
+
+def shifted(array, d_row, d_col, fill):
+    """Returns array where each square holds the value d_row rows and d_col columns away, or fill off the board."""
+    result = np.full_like(array, fill)
+    size = array.shape[1]
+    if abs(d_row) >= size or abs(d_col) >= size:
+        return result
+    row_slice = slice(max(0, -d_row), size - max(0, d_row))
+    col_slice = slice(max(0, -d_col), size - max(0, d_col))
+    source_rows = slice(max(0, d_row), size - max(0, -d_row))
+    source_cols = slice(max(0, d_col), size - max(0, -d_col))
+    result[:, row_slice, col_slice] = array[:, source_rows, source_cols]
+    return result
+
+
+def line_counts(occupied):
+    """Pieces on each square's row, column, diagonal and anti-diagonal, each shaped like occupied."""
+    count, size = occupied.shape[0], occupied.shape[1]
+    rows, cols = np.indices((size, size))
+    flat = occupied.reshape(count, size * size).astype(np.int32)
+    diagonal_members = np.eye(2 * size - 1, dtype=np.int32)[(rows - cols + size - 1).ravel()]
+    anti_diagonal_members = np.eye(2 * size - 1, dtype=np.int32)[(rows + cols).ravel()]
+    return {
+        'row': np.broadcast_to(occupied.sum(axis=2)[:, :, None], occupied.shape),
+        'col': np.broadcast_to(occupied.sum(axis=1)[:, None, :], occupied.shape),
+        'diagonal': (flat @ diagonal_members)[:, rows - cols + size - 1],
+        'anti_diagonal': (flat @ anti_diagonal_members)[:, rows + cols],
+    }
+
+
+def count_mobility(own, occupied, counts):
+    """Legal moves per position for the color in own, following Board.legal_moves."""
+    opponents = occupied & ~own
+    size = own.shape[1]
+    mobility = np.zeros(own.shape[0], dtype=np.int32)
+    for d_row, d_col in DIRECTIONS:
+        if d_row == 0:
+            distance = counts['row']
+        elif d_col == 0:
+            distance = counts['col']
+        elif d_row == d_col:
+            distance = counts['diagonal']
+        else:
+            distance = counts['anti_diagonal']
+        blocked = np.zeros_like(own)  # An opponent sits strictly between the piece and offset k
+        for offset in range(1, size):
+            on_board = shifted(np.ones_like(own), offset * d_row, offset * d_col, False)
+            target_own = shifted(own, offset * d_row, offset * d_col, False)
+            legal = own & (distance == offset) & on_board & ~target_own & ~blocked
+            mobility += legal.sum(axis=(1, 2))
+            blocked |= shifted(opponents, offset * d_row, offset * d_col, False)
+    return mobility
+
+
+def count_components(own):
+    """8-connected groups per position, by propagating the largest square id through each group."""
+    count, size = own.shape[0], own.shape[1]
+    ids = np.arange(1, size * size + 1, dtype=np.int32).reshape(size, size)
+    labels = np.where(own, ids, 0)
+    while True:
+        padded = np.pad(labels, ((0, 0), (1, 1), (1, 1)))
+        grown = labels.copy()
+        for d_row in range(3):
+            for d_col in range(3):
+                np.maximum(grown, padded[:, d_row:d_row + size, d_col:d_col + size], out=grown)
+        grown = np.where(own, grown, 0)
+        if np.array_equal(grown, labels):
+            break
+        labels = grown
+    return (own & (labels == ids)).sum(axis=(1, 2))
+
+
+def euler_number(own):
+    """Euler number (groups minus holes) from 2x2 quad counts, for 8-connectivity."""
+    padded = np.pad(own.astype(np.int8), ((0, 0), (1, 1), (1, 1)))
+    top_left, top_right = padded[:, :-1, :-1], padded[:, :-1, 1:]
+    bottom_left, bottom_right = padded[:, 1:, :-1], padded[:, 1:, 1:]
+    filled = top_left + top_right + bottom_left + bottom_right
+    q1 = (filled == 1).sum(axis=(1, 2))
+    q3 = (filled == 3).sum(axis=(1, 2))
+    diagonal = ((filled == 2) & (top_left == bottom_right)).sum(axis=(1, 2))
+    return (q1 - q3 - 2 * diagonal) / 4
+
+
+def features_batch(grids, color_index):
+    """Evaluation features of one color (TURN_ORDER index) for every grid, as a dict of (N,) arrays."""
+    size = grids.shape[1]
+    own = grids == color_index + 1
+    occupied = grids != 0
+    pieces = own.sum(axis=(1, 2))
+    safe_pieces = np.maximum(pieces, 1)
+    rows, cols = np.indices((size, size))
+    middle = (size - 1) / 2
+    center_weight = middle - np.maximum(abs(rows - middle), abs(cols - middle))
+
+    mean_row = (own * rows).sum(axis=(1, 2)) / safe_pieces
+    mean_col = (own * cols).sum(axis=(1, 2)) / safe_pieces
+    distance = np.maximum(abs(rows - mean_row[:, None, None]), abs(cols - mean_col[:, None, None]))
+
+    return {
+        'pieces': pieces,
+        'centralization': (own * center_weight).sum(axis=(1, 2)) / safe_pieces,
+        'concentration': (own * distance).sum(axis=(1, 2)),  # Sum of distances to the center of mass
+        'euler': euler_number(own),
+        'mobility': count_mobility(own, occupied, line_counts(occupied)),
+        'components': count_components(own),
+    }
+
+
+def score_features(features):
+    """Weighted sum of a features dict; works on scalars and arrays alike."""
+    pieces = np.maximum(features['pieces'], 1)
+    return (WEIGHTS['centralization'] * features['centralization']
+            + WEIGHTS['concentration'] * features['concentration'] / pieces
+            + WEIGHTS['euler'] * features['euler']
+            + WEIGHTS['mobility'] * features['mobility']
+            + WEIGHTS['components'] * features['components'])
+
+
+def evaluate_batch(positions, color_index):
+    """Scores many Positions at once from one color's view: its score minus the opponents' average."""
+    scores = np.zeros(len(positions))
+    by_size = {}
+    for index, position in enumerate(positions):
+        by_size.setdefault(position.size, []).append(index)
+
+    for indices in by_size.values():
+        grids = positions_to_grids([positions[index] for index in indices])
+        own_score = score_features(features_batch(grids, color_index))
+        opponent_total = np.zeros(len(indices))
+        opponent_count = np.zeros(len(indices))
+        for other_index in range(len(positions[indices[0]].masks)):
+            if other_index == color_index:
+                continue
+            other = features_batch(grids, other_index)
+            present = other['pieces'] > 0
+            opponent_total += np.where(present, score_features(other), 0.0)
+            opponent_count += present
+        scores[indices] = own_score - opponent_total / np.maximum(opponent_count, 1)
+    return scores
+
+
+def features(position, color_index):
+    """Evaluation features of one color in a single Position, as plain numbers."""
+    return {name: value[0].item() for name, value in features_batch(positions_to_grids([position]), color_index).items()}
+
+
+def evaluate(position, color_index):
+    return float(evaluate_batch([position], color_index)[0])
+
+
+def board_features(board, color, mobility=True):
+    """The features of features_batch for one color of a Board, from its bitboards in plain Python.
+
+    Batches pay off for many positions at once; a search scoring one leaf at a
+    time uses this instead, with the same definitions and WEIGHTS. Without
+    mobility the legal moves are not counted and mobility is reported as 0.
+    """
+    mask = board.color_masks.get(color, 0)
+    if not mask:
+        return {'pieces': 0, 'centralization': 0.0, 'concentration': 0.0, 'euler': 0.0, 'mobility': 0, 'components': 0}
+    rows, cols = [], []
+    while mask:
+        low_bit = mask & -mask
+        mask ^= low_bit
+        row, col = divmod(low_bit.bit_length() - 1, board.cols)
+        rows.append(row)
+        cols.append(col)
+    pieces = len(rows)
+
+    middle = (board.rows - 1) / 2
+    mean_row = sum(rows) / pieces
+    mean_col = sum(cols) / pieces
+    centralization = concentration = 0.0
+    for row, col in zip(rows, cols):
+        centralization += middle - max(abs(row - middle), abs(col - middle))
+        concentration += max(abs(row - mean_row), abs(col - mean_col))
+
+    # Euler number from 2x2 quad counts as in euler_number, on a bitboard with an empty border so nothing wraps
+    width = board.cols + 2
+    row_mask = (1 << board.cols) - 1
+    padded = 0
+    for row in range(board.rows):
+        padded |= (board.color_masks[color] >> row * board.cols & row_mask) << ((row + 1) * width + 1)
+    top_left, top_right, bottom_left, bottom_right = padded, padded >> 1, padded >> width, padded >> (width + 1)
+    three_or_more = ((top_left & top_right & (bottom_left | bottom_right))
+                     | (bottom_left & bottom_right & (top_left | top_right)))
+    q3 = bin(three_or_more & ~(top_left & top_right & bottom_left & bottom_right)).count('1')
+    q1 = bin(top_left ^ top_right ^ bottom_left ^ bottom_right).count('1') - q3
+    diagonal = bin((top_left & bottom_right & ~top_right & ~bottom_left)
+                   | (top_right & bottom_left & ~top_left & ~bottom_right)).count('1')
+
+    return {
+        'pieces': pieces,
+        'centralization': centralization / pieces,
+        'concentration': concentration,
+        'euler': (q1 - q3 - 2 * diagonal) / 4,
+        'mobility': sum(1 for _ in board.legal_moves(color)) if mobility else 0,
+        'components': board.count_components(color),
+    }
+
+
+def evaluate_board(board, color, colors, mobility=True):
+    """evaluate_batch's score for a single Board: color's score minus the average of the other colors with pieces."""
+    own_score = score_features(board_features(board, color, mobility))
+    opponent_scores = [score_features(board_features(board, other, mobility)) for other in colors
+                       if other != color and board.color_masks.get(other, 0)]
+    if not opponent_scores:
+        return float(own_score)
+    return float(own_score - sum(opponent_scores) / len(opponent_scores))
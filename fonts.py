@@ -0,0 +1,20 @@
+import functools
+import pygame
+
+fonts = {}  # (name, size) -> pygame font, created on first use
+
+
+def get_font(size, name='Arial'):
+    """Returns the shared font for a name and size; SysFont scans system fonts, so only call it once."""
+    key = (name, size)
+    font = fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        fonts[key] = font
+    return font
+
+
+@functools.lru_cache(maxsize=512)
+def render_text(text, size, color, name='Arial'):
+    """Returns an antialiased text surface, cached by (text, font, color). Callers must only blit it."""
+    return get_font(size, name).render(text, True, color)
@@ -1,16 +1,22 @@
+import logging
 import pygame
+from fonts import render_text
 from board import Board
 from menu import Menu
 from piece import Piece
 from computerPlayer import ComputerPlayer  # AI class
+from ai_worker import BackgroundMove
+from move_history import MoveHistory
+from saved_game import SavedGame, build_board, load_saved_game, player_colors, save_saved_game
 from HumanPlayer import HumanPlayer
 import os
 import time
 
+logger = logging.getLogger(__name__)
 
 class Game:
     def __init__(self, window, num_players, players_type, player_order=None, player_colors=None, board_size=None,
-                 player_color=None, computer_color=None, case=None):
+                 player_color=None, computer_color=None, case=None, async_ai=True):
         self.window = window
         self.num_players = num_players
         self.players_type = players_type
@@ -21,8 +27,7 @@ class Game:
         self.computer_color = computer_color  # For 2-player mode
         self.selected_piece = None
         self.error_message = ""  # To store error messages
-        self.move_history = []  # List to store move history
-        self.history_font = pygame.font.SysFont('Arial', 20)
+        self.move_history = None  # MoveHistory of the current board, created along with the board
         self.history_box_height = 150  # Height of the move history box
         self.history_offset = 10  # Padding within the history box
         self.show_history_button_rect = pygame.Rect(650, 20, 140, 50)  # Button to show move history
@@ -34,11 +39,13 @@ class Game:
         self.player_wins = {i: 0 for i in range(self.num_players)}  # Initialize rounds won for each player
         self.player_scores = {i: 0 for i in range(self.num_players)}  # Initialize scores for each player
         self.previous_winner_color = None  # Track the color of the previous round's winner
+        self.async_ai = async_ai  # Let computer players think in a background thread while the UI keeps running
+        self.pending_move = None  # BackgroundMove for the computer player whose turn it is
 
-        print(f"Initializing game with {num_players} players.")  # Debugging player count
+        logger.debug("Initializing game with %s players.", num_players)
 
         if case:
-            # Load the game state from the specified case file
+            # Load the game state from the specified case file; a bad file raises so the caller can stay in the menu
             self.load_game_state(case)
         else:
             # Initialize the game normally
@@ -46,30 +53,31 @@ class Game:
 
     def reset_game(self):
         """Resets all necessary game variables for a new round."""
-        print("Resetting the game for a new round...")  # Debugging
+        logger.debug("Resetting the game for a new round...")
+        self.cancel_pending_move()
 
         # Ensure the winner flag is properly reset
         self.winner_displayed = False
-        print(f"Winner flag reset: {self.winner_displayed}")  # Debugging the reset of the winner flag
+        logger.debug("Winner flag reset: %s", self.winner_displayed)
 
         # Reinitialize the board and verify it has no pieces
         self.board = Board(self.board_size)
-        print("New board initialized with size", self.board_size)  # Debugging board reset
-        print(f"Board state after reset: {self.board.pieces}")  # Debugging to check if pieces are cleared
+        logger.debug("New board initialized with size %s", self.board_size)
+        logger.debug("Board state after reset: %s", self.board.pieces)
 
         self.selected_piece = None
         self.error_message = ""
-        self.move_history = []
+        self.move_history = MoveHistory(self.board)
         self.players = self.create_players()  # Recreate players for the new game
-        print(f"Players created: {self.players}")  # Debugging
+        logger.debug("Players created: %s", self.players)
 
         # Check player count and player list integrity
-        print(f"Number of players: {len(self.players)}")  # Debugging player count
+        logger.debug("Number of players: %s", len(self.players))
         if len(self.players) != self.num_players:
-            print(f"Error: Expected {self.num_players} players but got {len(self.players)}")
+            logger.error("Expected %s players but got %s", self.num_players, len(self.players))
 
         # Reset move history and error messages
-        print("Move history cleared, and error messages reset.")
+        logger.debug("Move history cleared, and error messages reset.")
 
         # Ensure proper first turn setup for 2-player or 4-player mode
         if self.num_players == 2:
@@ -77,56 +85,57 @@ class Game:
             if self.previous_winner_color == (255, 255, 255) and self.player_wins[0] != self.player_wins[1]:
                 # Swap colors: the player (who was white) now plays with black
                 self.player_color, self.computer_color = self.computer_color, self.player_color
-                print(f"Swapping colors. Player color: {self.get_color_name(self.player_color)}, "
-                      f"Computer color: {self.get_color_name(self.computer_color)}")
+                logger.debug("Swapping colors. Player color: %s, Computer color: %s",
+                             self.get_color_name(self.player_color), self.get_color_name(self.computer_color))
 
             # Set the current turn based on who has the black pieces
             if self.player_color == (0, 0, 0):  # Black
                 self.current_turn = 0  # Player moves first
-                print("Player (Black) moves first.")
+                logger.debug("Player (Black) moves first.")
             else:
                 self.current_turn = 1  # Computer moves first
-                print("Computer (Black) moves first.")
+                logger.debug("Computer (Black) moves first.")
         else:
             # For 4-player mode, reset player turns starting with black
             black_player = [player for player, color in self.player_colors.items() if color == (0, 0, 0)][0]
             self.current_turn = black_player - 1  # Set the current turn to the player assigned to Black
-            print(f"Player {black_player} (Black) moves first.")  # Debugging
+            logger.debug("Player %s (Black) moves first.", black_player)
 
     def create_players(self):
         """Creates the players for the game based on the number of players and their types."""
         players = []
-        print("Creating players...")  # Debugging
+        logger.debug("Creating players...")
 
         if self.num_players == 2:
             colors = [self.player_color, self.computer_color]
-            print(f"2-player game with colors: {colors}")  # Debugging
+            logger.debug("2-player game with colors: %s", colors)
             for i in range(self.num_players):  # 0-based index for 2-player
                 if self.players_type[i] == "Computer":
-                    print(f"Player {i + 1} is a computer.")  # Debugging
+                    logger.debug("Player %s is a computer.", i + 1)
                     players.append(ComputerPlayer(self.board, colors[i]))  # AI player
                 else:
-                    print(f"Player {i + 1} is a human.")  # Debugging
+                    logger.debug("Player %s is a human.", i + 1)
                     players.append(HumanPlayer())  # Use HumanPlayer class
         else:
             # In 4-player mode, use player_colors (which is a dictionary with keys 1-4)
             for i in range(1, self.num_players + 1):  # 1-based index for 4-player
                 if self.players_type[i - 1] == "Computer":
-                    print(f"Player {i} is a computer. Color: {self.player_colors[i]}")  # Debugging
+                    logger.debug("Player %s is a computer. Color: %s", i, self.player_colors[i])
                     players.append(ComputerPlayer(self.board, self.player_colors[i]))  # AI player
                 else:
-                    print(f"Player {i} is a human. Color: {self.player_colors[i]}")  # Debugging
+                    logger.debug("Player %s is a human. Color: %s", i, self.player_colors[i])
                     players.append(HumanPlayer())  # Use HumanPlayer class
 
-        print(f"Players created: {players}")  # Debugging
+        logger.debug("Players created: %s", players)
         return players
 
     def update(self):
         """Update the game state and handle rendering."""
-        print("Game update running...")  # Debugging
-        print(f"Winner flag before update: {self.winner_displayed}")  # Debugging
-        print(f"Current turn: {self.current_turn}")  # Debugging
-        print(f"Current player: {type(self.players[self.current_turn])}")  # Debugging
+        if logger.isEnabledFor(logging.DEBUG):  # Runs every frame, so skip the calls entirely when off
+            logger.debug("Game update running...")
+            logger.debug("Winner flag before update: %s", self.winner_displayed)
+            logger.debug("Current turn: %s", self.current_turn)
+            logger.debug("Current player: %s", type(self.players[self.current_turn]))
 
         self.winner_displayed = False
         self.window.fill((255, 255, 255))  # Fill the screen with white
@@ -138,44 +147,74 @@ class Game:
 
         # Check for a winner
         if not self.winner_displayed:
-            print("Checking for a winner...")  # Debugging
+            logger.debug("Checking for a winner...")
             self.check_winner()
         else:
-            print("Winner has already been displayed, skipping winner check.")  # Debugging
+            logger.debug("Winner has already been displayed, skipping winner check.")
 
         # If it's an AI's turn, make the move
         if isinstance(self.players[self.current_turn], ComputerPlayer):
-            print(f"Computer player {self.current_turn + 1} is making a move...")  # Debugging
-            move = self.players[self.current_turn].make_move()  # Capture move details
+            if self.async_ai:
+                self.update_background_move()
+                return
+
+            logger.debug("Computer player %s is making a move...", self.current_turn + 1)
+            move = self.players[self.current_turn].choose_move()
 
             if move is None:
-                print("No valid move found by the computer.")
-                self.end_turn()
+                logger.debug("No valid move found by the computer.")
+                self.pass_turn()
             else:
-                start_row, start_col, end_row, end_col = move
-                self.add_to_move_history(self.board.get_piece(end_row, end_col), start_row, start_col, end_row, end_col)
-                self.end_turn()  # Move to the next player after the AI move
+                self.play_move(move[0], move[1])
+            self.end_turn()  # Move to the next player after the AI move
 
         elif isinstance(self.players[self.current_turn], HumanPlayer):
             # For human player, we expect interaction via mouse clicks handled elsewhere
-            print(f"Human player {self.current_turn + 1}'s turn.")  # Debugging
+            logger.debug("Human player %s's turn.", self.current_turn + 1)
             # The update loop will continue waiting for the human player's input to make a move
             # This is handled through the `handle_click` method when the user interacts with the board
         else:
-            print(f"Unknown player type. Turn skipped.")  # Debugging
+            logger.debug("Unknown player type. Turn skipped.")
+
+    def update_background_move(self):
+        """Starts the computer player's search in the background, or plays its move once the search is done."""
+        player = self.players[self.current_turn]
+        if self.pending_move is None:
+            logger.debug("Computer player %s is thinking...", self.current_turn + 1)
+            self.pending_move = BackgroundMove(player)
+            return
+        if not self.pending_move.done():
+            return  # Keep drawing and handling events while the search runs
+
+        move = self.pending_move.result()
+        self.pending_move = None
+        if move is None:
+            logger.debug("No valid move found by the computer.")
+            self.pass_turn()
+        else:
+            self.play_move(move[0], move[1])
+        self.end_turn()
+
+    def cancel_pending_move(self):
+        """Abandons a computer player's background search, e.g. on quit or reset."""
+        if self.pending_move is not None:
+            self.pending_move.cancel()
+            self.pending_move = None
+
+    def is_busy(self):
+        """Checks whether the game moves on without user input, i.e. a computer player is due to move."""
+        return isinstance(self.players[self.current_turn], ComputerPlayer)
 
     def display_error_message(self):
         """Displays any error messages (e.g., invalid moves)."""
         if self.error_message:
-            font = pygame.font.SysFont('Arial', 24)
-            text_surface = font.render(self.error_message, True, (255, 0, 0))
+            text_surface = render_text(self.error_message, 24, (255, 0, 0))
             self.window.blit(text_surface, (10, 10))
 
     def display_show_history_button(self):
         """Displays a button to show move history."""
         pygame.draw.rect(self.window, (0, 0, 0), self.show_history_button_rect)
-        font = pygame.font.SysFont('Arial', 20)
-        text_surface = font.render("Show History", True, (255, 255, 255))
+        text_surface = render_text("Show History", 20, (255, 255, 255))
         text_rect = text_surface.get_rect(center=self.show_history_button_rect.center)
         self.window.blit(text_surface, text_rect)
 
@@ -187,6 +226,8 @@ class Game:
             self.save_game_state()  # Save the game when the button is clicked
         elif self.help_button_rect.collidepoint(pos):
             self.display_help()  # Display help for the human player when the Help button is clicked
+        elif self.is_busy():
+            return  # The board belongs to the computer player while it is thinking
         else:
             # Handle selecting and moving pieces as usual
             row, col = self.get_row_col_from_mouse(pos)
@@ -197,54 +238,74 @@ class Game:
                     self.select_piece(row, col)
 
     def show_move_history_popup(self):
-        """Displays the move history in a popup window."""
+        """Displays the move history in a popup window; the arrow keys and mouse wheel scroll it."""
         popup_width, popup_height = 400, 600
         popup_window = pygame.display.set_mode((popup_width, popup_height))
         pygame.display.set_caption("Move History")
 
+        line_height = render_text("Player", 20, (0, 0, 0)).get_height() + 5
+        visible_lines = (popup_height - 40) // line_height
+        last_line = max(0, self.move_history.ply - visible_lines)
+        first_line = last_line  # Open at the most recent moves
+
         running = True
+        redraw = True
         while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    running = False
-
-            popup_window.fill((240, 240, 240))
-
-            y_position = 20
-            for move in self.move_history:
-                move_surface = self.history_font.render(move, True, (0, 0, 0))
-                popup_window.blit(move_surface, (20, y_position))
-                y_position += move_surface.get_height() + 5
-
-            pygame.display.flip()
+            if redraw:
+                # Only the visible lines are built and rendered, and only when the view changes
+                popup_window.fill((240, 240, 240))
+                y_position = 20
+                for line in self.move_history.lines(first_line, first_line + visible_lines):
+                    popup_window.blit(render_text(line, 20, (0, 0, 0)), (20, y_position))
+                    y_position += line_height
+                pygame.display.flip()
+                redraw = False
+
+            event = pygame.event.wait()
+            scroll = first_line
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key in (pygame.K_UP, pygame.K_DOWN):
+                scroll += 1 if event.key == pygame.K_DOWN else -1
+            elif event.type == pygame.KEYDOWN and event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+                scroll += visible_lines if event.key == pygame.K_PAGEDOWN else -visible_lines
+            elif event.type == pygame.MOUSEWHEEL:
+                scroll -= 3 * event.y
+            elif event.type == pygame.WINDOWEXPOSED:
+                redraw = True
+            scroll = max(0, min(scroll, last_line))
+            if scroll != first_line:
+                first_line = scroll
+                redraw = True
 
         # Restore the main game window after the popup is closed
         self.window = pygame.display.set_mode((800, 800))
 
     def check_winner(self):
-        """Checks if a player has won by forming a connected group of pieces."""
+        """Checks if a player has won, with the same rule as the engines: Board.get_winner after the last move."""
         if not self.winner_displayed:
-            print("Checking for winner...")  # Debugging
-            if self.num_players == 2:
-                colors = [self.player_color, self.computer_color]
-            else:
-                colors = list(self.player_colors.values())  # Correct way to extract player colors
-
-            for color in colors:
-                if self.board.check_connected_group(color):
-                    print(f"Winner found: {self.get_color_name(color)}")  # Debugging
-                    self.display_winner(color)
-                    self.winner_displayed = True  # Ensure we stop checking once the winner is displayed
-                    print(f"Winner flag set to {self.winner_displayed} after finding winner")  # Debugging
-                    break  # Exit loop once a winner is found
+            logger.debug("Checking for winner...")
+            winner = self.board.get_winner(self.last_mover())
+            if winner is not None:
+                logger.debug("Winner found: %s", self.get_color_name(winner))
+                self.display_winner(winner)
+                self.winner_displayed = True  # Ensure we stop checking once the winner is displayed
+                logger.debug("Winner flag set to %s after finding winner", self.winner_displayed)
             else:
-                print("No winner found yet.")  # Debugging
+                logger.debug("No winner found yet.")
+
+    def last_mover(self):
+        """Color of the player who made the last move on the board, or None if none has been played."""
+        for record in reversed(self.move_history.records[:self.move_history.ply]):
+            if record.start is not None:
+                return record.color
+        return None
 
     def display_winner(self, color):
         """Displays the winner in a popup window and shows scores and rounds won."""
-        print(f"Displaying winner: {self.get_color_name(color)}")  # Debugging
+        logger.debug("Displaying winner: %s", self.get_color_name(color))
         player_number = self.get_player_number(color)  # Get the player number
 
         # Update the player's score and rounds won
@@ -254,37 +315,38 @@ class Game:
         popup_window = pygame.display.set_mode((popup_width, popup_height))
         pygame.display.set_caption("Game Over")
 
-        font = pygame.font.SysFont('Arial', 30)
         color_name = self.get_color_name(color)
-        text_surface = font.render(f"Player {player_number} ({color_name}) Wins!", True, (0, 0, 0))
+        text_surface = render_text(f"Player {player_number} ({color_name}) Wins!", 30, (0, 0, 0))
         text_rect = text_surface.get_rect(center=(popup_width // 2, 50))
 
-        # Create smaller font for scores and rounds
-        info_font = pygame.font.SysFont('Arial', 20)
-
         # Prepare text surfaces for player scores and rounds won
         scores_text = [f"Player {i + 1} - Rounds Won: {self.player_wins[i]}, Score: {self.player_scores[i]}"
                        for i in range(self.num_players)]
-        scores_surfaces = [info_font.render(score_text, True, (0, 0, 0)) for score_text in scores_text]
+        scores_surfaces = [render_text(score_text, 20, (0, 0, 0)) for score_text in scores_text]
 
         running = True
+        redraw = True
         while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-                    running = False  # Close the popup when Enter is pressed
-
-            popup_window.fill((240, 240, 240))
-            popup_window.blit(text_surface, text_rect)
-
-            # Display scores and rounds
-            y_offset = 100  # Start displaying below the winner text
-            for surface in scores_surfaces:
-                popup_window.blit(surface, (20, y_offset))
-                y_offset += 30  # Move down for the next line of text
-
-            pygame.display.flip()
+            if redraw:
+                popup_window.fill((240, 240, 240))
+                popup_window.blit(text_surface, text_rect)
+
+                # Display scores and rounds
+                y_offset = 100  # Start displaying below the winner text
+                for surface in scores_surfaces:
+                    popup_window.blit(surface, (20, y_offset))
+                    y_offset += 30  # Move down for the next line of text
+
+                pygame.display.flip()
+                redraw = False
+
+            event = pygame.event.wait()  # Sleeps until something happens instead of redrawing every frame
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+                running = False  # Close the popup when Enter is pressed
+            elif event.type == pygame.WINDOWEXPOSED:
+                redraw = True
 
         self.ask_replay()
 
@@ -320,52 +382,56 @@ class Game:
         self.previous_winner_color = color
 
         # Log the updated scores and rounds won
-        print(f"Updated Score for Player {player_number}: {self.player_scores[player_number - 1]}")
-        print(f"Rounds Won by Player {player_number}: {self.player_wins[player_number - 1]}")
+        logger.debug("Updated Score for Player %s: %s", player_number, self.player_scores[player_number - 1])
+        logger.debug("Rounds Won by Player %s: %s", player_number, self.player_wins[player_number - 1])
 
     def ask_replay(self):
         """Prompts the player to replay the game or quit."""
-        print("Asking the user if they want to replay...")  # Debugging
+        logger.debug("Asking the user if they want to replay...")
         popup_width, popup_height = 400, 200
         popup_window = pygame.display.set_mode((popup_width, popup_height))
         pygame.display.set_caption("Play Again?")
 
-        font = pygame.font.SysFont('Arial', 24)
-        prompt_surface = font.render("Play Again?", True, (0, 0, 0))
+        prompt_surface = render_text("Play Again?", 24, (0, 0, 0))
         prompt_rect = prompt_surface.get_rect(center=(popup_width // 2, popup_height // 2 - 30))
 
         yes_button_rect = pygame.Rect(popup_width // 2 - 60, popup_height // 2 + 20, 50, 30)
         no_button_rect = pygame.Rect(popup_width // 2 + 10, popup_height // 2 + 20, 50, 30)
 
+        yes_text = render_text("Yes", 24, (0, 0, 0))
+        no_text = render_text("No", 24, (0, 0, 0))
+
         running = True
+        redraw = True
         while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            if redraw:
+                popup_window.fill((240, 240, 240))
+                popup_window.blit(prompt_surface, prompt_rect)
+
+                pygame.draw.rect(popup_window, (0, 255, 0), yes_button_rect)  # Green for Yes
+                pygame.draw.rect(popup_window, (255, 0, 0), no_button_rect)  # Red for No
+
+                popup_window.blit(yes_text, yes_button_rect.move(5, 0))
+                popup_window.blit(no_text, no_button_rect.move(10, 0))
+
+                pygame.display.flip()
+                redraw = False
+
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                exit()
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if yes_button_rect.collidepoint(event.pos):
+                    logger.debug("User chose to replay.")
+                    self.reset_game()  # Reset game state
+                    running = False  # Exit the loop
+                elif no_button_rect.collidepoint(event.pos):
+                    logger.debug("User chose not to replay. Exiting...")
                     pygame.quit()
                     exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if yes_button_rect.collidepoint(event.pos):
-                        print("User chose to replay.")  # Debugging
-                        self.reset_game()  # Reset game state
-                        running = False  # Exit the loop
-                    elif no_button_rect.collidepoint(event.pos):
-                        print("User chose not to replay. Exiting...")  # Debugging
-                        pygame.quit()
-                        exit()
-
-            popup_window.fill((240, 240, 240))
-            popup_window.blit(prompt_surface, prompt_rect)
-
-            pygame.draw.rect(popup_window, (0, 255, 0), yes_button_rect)  # Green for Yes
-            pygame.draw.rect(popup_window, (255, 0, 0), no_button_rect)  # Red for No
-
-            yes_text = font.render("Yes", True, (0, 0, 0))
-            no_text = font.render("No", True, (0, 0, 0))
-
-            popup_window.blit(yes_text, yes_button_rect.move(5, 0))
-            popup_window.blit(no_text, no_button_rect.move(10, 0))
-
-            pygame.display.flip()
+            elif event.type == pygame.WINDOWEXPOSED:
+                redraw = True
 
         self.window = pygame.display.set_mode((800, 800))
 
@@ -389,7 +455,7 @@ class Game:
         """Handles selecting a piece on the board."""
         piece = self.board.get_piece(row, col)
         if piece and self.is_correct_turn(piece):
-            print(f"Selected piece at {row}, {col} for {self.get_color_name(piece.color)}.")  # Debugging
+            logger.debug("Selected piece at %s, %s for %s.", row, col, self.get_color_name(piece.color))
             self.selected_piece = piece
             self.error_message = ""  # Clear error message when a piece is successfully selected
 
@@ -401,13 +467,12 @@ class Game:
 
             is_valid, message = self.board.is_valid_move(self.selected_piece, row, col)
             if is_valid:
-                print(f"Moving piece from {start_row}, {start_col} to {row}, {col}.")  # Debugging
-                self.add_to_move_history(self.selected_piece, start_row, start_col, row, col)
-                self.board.move_piece(self.selected_piece, row, col)
+                logger.debug("Moving piece from %s, %s to %s, %s.", start_row, start_col, row, col)
+                self.play_move((start_row, start_col), (row, col))
                 self.end_turn()
                 self.error_message = ""
             else:
-                print(f"Invalid move attempted: {message}")  # Debugging
+                logger.debug("Invalid move attempted: %s", message)
                 self.error_message = message
                 self.selected_piece = None
 
@@ -416,35 +481,80 @@ class Game:
         self.selected_piece = None
         # Increment the current turn to the next player
         self.current_turn = (self.current_turn + 1) % self.num_players
-        print(f"Turn ended. Next player's turn: {self.current_turn}")  # Debugging statement
+        logger.debug("Turn ended. Next player's turn: %s", self.current_turn)
 
     def is_correct_turn(self, piece):
         """Checks if it's the correct player's turn to move the selected piece."""
+        return piece.color == self.get_current_color()
+
+    def get_current_color(self):
+        """Returns the color of the player whose turn it is."""
         if self.num_players == 2:
             if self.current_turn == 0:  # Player's turn
-                return piece.color == self.player_color
+                return self.player_color
             else:  # Computer's turn
-                return piece.color == self.computer_color
+                return self.computer_color
         else:
             # 4-player mode logic
-            current_color = \
-                [(player, color) for player, color in self.player_colors.items() if player == self.current_turn + 1][0][
-                    1]
-            return piece.color == current_color
-
-    def add_to_move_history(self, piece, start_row, start_col, end_row, end_col):
-        """Adds the current move to the move history with a descriptive message."""
-        start_notation = self.board.get_position_notation(start_row, start_col)
-        end_notation = self.board.get_position_notation(end_row, end_col)
+            return self.player_colors[self.current_turn + 1]
+
+    def play_move(self, start, end):
+        """Plays the current player's move on the board and records it in the move history."""
+        color = self.get_current_color()
+        self.move_history.play(start, end, self.current_turn, self.get_player_number(color))
+        logger.debug("Move added to history: %s", self.move_history.records[-1])
+
+    def pass_turn(self):
+        """Records that the current player could not move."""
+        color = self.get_current_color()
+        self.move_history.record_pass(color, self.current_turn, self.get_player_number(color))
+
+    def handle_key(self, key, modifiers=0):
+        """Steps through the move history: Left/Ctrl+Z undo, Right/Ctrl+Y redo, Home and End jump."""
+        control = modifiers & pygame.KMOD_CTRL
+        if key == pygame.K_LEFT or (control and key == pygame.K_z):
+            self.undo_move()
+        elif key == pygame.K_RIGHT or (control and key == pygame.K_y):
+            self.redo_move()
+        elif key == pygame.K_HOME:
+            self.jump_to_ply(0)
+        elif key == pygame.K_END:
+            self.jump_to_ply(len(self.move_history))
+
+    def has_human_player(self):
+        return any(isinstance(player, HumanPlayer) for player in self.players)
+
+    def undo_move(self):
+        """Takes back moves until it is a human player's turn again, or one move if nobody is human."""
+        self.cancel_pending_move()
+        while self.move_history.can_undo():
+            self.current_turn = self.move_history.undo().turn
+            if not self.has_human_player() or not self.is_busy():
+                break
+        self.selected_piece = None
+        self.error_message = ""
 
-        # Determine the player number and color
-        player_number = self.get_player_number(piece.color)
-        color_name = self.get_color_name(piece.color)
+    def redo_move(self):
+        """Replays undone moves up to the next human player's turn, or one move if nobody is human."""
+        self.cancel_pending_move()
+        while self.move_history.can_redo():
+            self.current_turn = (self.move_history.redo().turn + 1) % self.num_players
+            if not self.has_human_player() or not self.is_busy():
+                break
+        self.selected_piece = None
+        self.error_message = ""
 
-        # Construct a descriptive move message
-        move = f"Player {player_number} ({color_name}) moved {start_notation} to {end_notation}"
-        self.move_history.append(move)
-        print(f"Move added to history: {move}")  # Debugging
+    def jump_to_ply(self, ply):
+        """Shows the position after ply moves, undoing or replaying only the moves in between."""
+        self.cancel_pending_move()
+        self.move_history.jump_to(ply)
+        records = self.move_history.records
+        if self.move_history.ply < len(records):
+            self.current_turn = records[self.move_history.ply].turn
+        elif records:
+            self.current_turn = (records[-1].turn + 1) % self.num_players
+        self.selected_piece = None
+        self.error_message = ""
 
     def get_color_name(self, color):
         """Convert an RGB color tuple to a string representing the color name."""
@@ -462,8 +572,7 @@ class Game:
     def display_save_game_button(self):
         """Displays the 'Save Game' button."""
         pygame.draw.rect(self.window, (0, 0, 0), self.save_game_button_rect)  # Draw button rectangle
-        font = pygame.font.SysFont('Arial', 20)
-        text_surface = font.render("Save Game", True, (255, 255, 255))  # Button text
+        text_surface = render_text("Save Game", 20, (255, 255, 255))  # Button text
         text_rect = text_surface.get_rect(center=self.save_game_button_rect.center)
         self.window.blit(text_surface, text_rect)  # Render the button text onto the window
 
@@ -472,123 +581,78 @@ class Game:
         # Specify the file path for saving the game state
         save_file_path = "game_state.txt"
 
-        try:
-            with open(save_file_path, 'w') as save_file:
-                # Write board state
-                save_file.write("Board:\n")
-                for row in range(self.board.rows):
-                    for col in range(self.board.cols):
-                        piece = self.board.get_piece(row, col)
-                        if piece:
-                            # Save piece color ('B' for black, 'W' for white, etc.)
-                            piece_symbol = self.get_color_symbol(piece.color)
-                        else:
-                            # Empty spaces represented by '.'
-                            piece_symbol = '.'
-                        save_file.write(piece_symbol + ' ')
-                    save_file.write('\n')
-
-                # Write player information (for 2-player mode)
-                if self.num_players == 2:
-                    save_file.write("\nPlayers:\n")
-                    save_file.write("Player 1 Color: " + self.get_color_name(self.player_color) + "\n")
-                    save_file.write("Player 2 Color: " + self.get_color_name(self.computer_color) + "\n")
-
-                # Write move history
-                save_file.write("\nMove History:\n")
-                for move in self.move_history:
-                    save_file.write(move + "\n")
-
-                # Write current turn
-                save_file.write("\nCurrent Turn: Player " + str(self.current_turn + 1) + "\n")
-
-            print("Game state saved successfully.")
-        except Exception as e:
-            print(f"Error saving game state: {e}")
-
-    def get_color_symbol(self, color):
-        """Returns a single-character symbol representing the piece color."""
-        if color == (0, 0, 0):
-            return 'B'  # Black
-        elif color == (255, 255, 255):
-            return 'W'  # White
-        elif color == (255, 0, 0):
-            return 'R'  # Red
-        elif color == (0, 255, 0):
-            return 'G'  # Green
+        if self.num_players == 2:
+            player_colors = (self.player_color, self.computer_color)
         else:
-            return '.'  # Unknown color or empty
+            player_colors = tuple(self.player_colors[number] for number in range(1, self.num_players + 1))
+        moves = [(record.player_number, record.color, record.start, record.end)
+                 for record in self.move_history.records[:self.move_history.ply]]
+        pieces = tuple((piece.row, piece.col, piece.color) for piece in self.board.pieces)
+        saved = SavedGame(self.board.rows, pieces, player_colors, moves, self.current_turn, None, None)
+
+        try:
+            save_saved_game(save_file_path, saved)
+            logger.info("Game state saved successfully.")
+        except OSError as e:
+            logger.error("Error saving game state: %s", e)
 
     def load_game_state(self, case_number):
-        """Loads a saved game state from a file."""
+        """Loads a game case by number, or any file written by save_game_state by path.
+
+        Raises OSError or ValueError, before changing anything, if the file cannot
+        be read or does not say whose turn it is.
+        """
         file_path = f"game_case_{case_number}.txt"
+        if isinstance(case_number, str) and os.path.isfile(case_number):
+            file_path = case_number
+
+        saved = load_saved_game(file_path)
+        colors = player_colors(saved)
+        if not colors and (saved.next_player is None or saved.next_color is None):
+            raise ValueError(f"{file_path} does not say whose turn it is")
+
+        self.cancel_pending_move()
+        logger.debug("Initializing board from loaded state...")
+        self.board_size = saved.board_size
+        self.board = build_board(saved)
+        self.move_history = MoveHistory(self.board)
+        self.selected_piece = None
+        self.error_message = ""
 
-        if not os.path.exists(file_path):
-            print(f"Error: {file_path} not found.")
-            return
+        if len(colors) > 2:
+            # A 4-player save: extra players beyond the menu's choices are computers
+            self.num_players = len(colors)
+            self.player_colors = {number: color for number, color in enumerate(colors, 1)}
+            self.players_type = (list(self.players_type) + ["Computer"] * self.num_players)[:self.num_players]
+            self.player_wins = {i: 0 for i in range(self.num_players)}
+            self.player_scores = {i: 0 for i in range(self.num_players)}
+            self.current_turn = saved.current_turn or 0
+        elif colors:
+            self.player_color, self.computer_color = colors
+            self.current_turn = saved.current_turn or 0
+        else:
+            # Game case files name the side to move instead of listing the players
+            other_color = (255, 255, 255) if saved.next_color == (0, 0, 0) else (0, 0, 0)
+            if saved.next_player == "Computer":
+                self.computer_color, self.player_color = saved.next_color, other_color
+                self.current_turn = 1  # Computer's turn
+            else:
+                self.player_color, self.computer_color = saved.next_color, other_color
+                self.current_turn = 0  # Human's turn
 
-        try:
-            with open(file_path, 'r') as load_file:
-                lines = load_file.readlines()
-                print(f"Loaded lines: {lines}")  # Debugging statement
-
-                # Initialize the board and clear it
-                self.board = Board(self.board_size, initialize=False)
-                self.board.clear_board()  # This now works with the corrected method
-                print("Initializing board from loaded state...")
-
-                # Load the board state
-                board_section = lines[1:self.board_size + 1]
-                for row, line in enumerate(board_section):
-                    pieces = line.strip().split()
-                    for col, piece_symbol in enumerate(pieces):
-                        piece_symbol = piece_symbol.upper()  # Convert to uppercase
-                        if piece_symbol == 'B':
-                            color_rgb = (0, 0, 0)  # Black piece RGB
-                            self.board.set_piece(row, col, color_rgb)
-                        elif piece_symbol == 'W':
-                            color_rgb = (255, 255, 255)  # White piece RGB
-                            self.board.set_piece(row, col, color_rgb)
-
-                # Extract next player and color information from the file
-                next_player_line = lines[-2].strip().split(": ")[1]  # Should be 'Human' or 'Computer'
-                next_color_line = lines[-1].strip().split(": ")[1]  # Should be 'White' or 'Black'
-
-                # Determine who is who
-                if next_player_line == "Computer":
-                    # If the computer is the next player
-                    if next_color_line == "Black":
-                        self.computer_color = (0, 0, 0)
-                        self.player_color = (255, 255, 255)
-                    else:  # White
-                        self.computer_color = (255, 255, 255)
-                        self.player_color = (0, 0, 0)
-                    self.current_turn = 1  # Computer's turn
-                else:  # Human
-                    if next_color_line == "Black":
-                        self.player_color = (0, 0, 0)
-                        self.computer_color = (255, 255, 255)
-                    else:  # White
-                        self.player_color = (255, 255, 255)
-                        self.computer_color = (0, 0, 0)
-                    self.current_turn = 0  # Human's turn
-
-                print(f"Player color set to: {self.get_color_name(self.player_color)}")
-                print(f"Computer color set to: {self.get_color_name(self.computer_color)}")
-                print(f"Current turn set to: {self.current_turn}")
-
-                # Create players after setting player colors
-                self.players = self.create_players()
-
-                print("Game state loaded successfully.")
-        except Exception as e:
-            print(f"Error loading game state: {e}")
+        logger.debug("Player color set to: %s", self.get_color_name(self.player_color))
+        logger.debug("Computer color set to: %s", self.get_color_name(self.computer_color))
+        logger.debug("Current turn set to: %s", self.current_turn)
+
+        # Create players after setting player colors
+        self.players = self.create_players()
+
+        logger.info("Game state loaded successfully.")
 
     def display_help_button(self):
         """Displays the 'Help' button."""
         pygame.draw.rect(self.window, (0, 0, 0), self.help_button_rect)  # Draw button rectangle
-        font = pygame.font.SysFont('Arial', 20)
-        text_surface = font.render("Help", True, (255, 255, 255))  # Button text
+        text_surface = render_text("Help", 20, (255, 255, 255))  # Button text
         text_rect = text_surface.get_rect(center=self.help_button_rect.center)
         self.window.blit(text_surface, text_rect)  # Render the button text onto the window
 
@@ -601,38 +665,41 @@ class Game:
         popup_window = pygame.display.set_mode((popup_width, popup_height))
         pygame.display.set_caption("Help - Possible Moves")
 
-        font = pygame.font.SysFont('Arial', 20)
-
         running = True
+        redraw = True
         while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    running = False
-
-            popup_window.fill((240, 240, 240))
-
-            y_position = 20
-            if capture_moves:
-                capture_title = font.render("Capture Moves:", True, (0, 0, 0))
-                popup_window.blit(capture_title, (20, y_position))
-                y_position += 30
-                for move in capture_moves:
-                    move_surface = font.render(move, True, (0, 0, 0))
-                    popup_window.blit(move_surface, (20, y_position))
-                    y_position += move_surface.get_height() + 5
-
-            if possible_moves:
-                non_capture_title = font.render("Possible Moves:", True, (0, 0, 0))
-                popup_window.blit(non_capture_title, (20, y_position))
-                y_position += 30
-                for move in possible_moves:
-                    move_surface = font.render(move, True, (0, 0, 0))
-                    popup_window.blit(move_surface, (20, y_position))
-                    y_position += move_surface.get_height() + 5
-
-            pygame.display.flip()
+            if redraw:
+                popup_window.fill((240, 240, 240))
+
+                y_position = 20
+                if capture_moves:
+                    capture_title = render_text("Capture Moves:", 20, (0, 0, 0))
+                    popup_window.blit(capture_title, (20, y_position))
+                    y_position += 30
+                    for move in capture_moves:
+                        move_surface = render_text(move, 20, (0, 0, 0))
+                        popup_window.blit(move_surface, (20, y_position))
+                        y_position += move_surface.get_height() + 5
+
+                if possible_moves:
+                    non_capture_title = render_text("Possible Moves:", 20, (0, 0, 0))
+                    popup_window.blit(non_capture_title, (20, y_position))
+                    y_position += 30
+                    for move in possible_moves:
+                        move_surface = render_text(move, 20, (0, 0, 0))
+                        popup_window.blit(move_surface, (20, y_position))
+                        y_position += move_surface.get_height() + 5
+
+                pygame.display.flip()
+                redraw = False
+
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                redraw = True
 
         # Restore the main game window after the popup is closed
         self.window = pygame.display.set_mode((800, 800))
@@ -641,81 +708,15 @@ class Game:
         """Generates all possible valid moves for the human player."""
         possible_moves = []
         capture_moves = []
-        color = self.player_color if self.current_turn == 0 else self.computer_color  # Get the current player's color
-
-        # Iterate through all pieces on the board
-        for row in range(self.board.rows):
-            for col in range(self.board.cols):
-                piece = self.board.get_piece(row, col)
-                if piece and piece.color == color:
-                    # Generate moves for this piece
-                    moves, captures = self.generate_moves_for_piece(row, col)
-                    possible_moves.extend(moves)
-                    capture_moves.extend(captures)
+        color = self.get_current_color()  # Get the current player's color
 
-        return possible_moves, capture_moves
-
-    def generate_moves_for_piece(self, start_row, start_col):
-        """Generates valid moves for a specific piece."""
-        moves = []
-        captures = []
-        piece = self.board.get_piece(start_row, start_col)
-
-        # Horizontal, Vertical, and Diagonal moves
-        # Use logic similar to the ComputerPlayer to generate moves
-        horizontal_moves_required = self.board.count_pieces_on_line(start_row, is_row=True)
-        vertical_moves_required = self.board.count_pieces_on_line(start_col, is_row=False)
-        diagonal_moves_required = self.board.count_diagonal_pieces(start_row, start_col, start_row, start_col)
-
-        # Horizontal moves
-        for offset in range(1, horizontal_moves_required + 1):
-            self.add_human_move_if_valid(start_row, start_col, start_row, start_col + offset, moves, captures)  # Right
-            self.add_human_move_if_valid(start_row, start_col, start_row, start_col - offset, moves, captures)  # Left
-
-        # Vertical moves
-        for offset in range(1, vertical_moves_required + 1):
-            self.add_human_move_if_valid(start_row, start_col, start_row + offset, start_col, moves, captures)  # Down
-            self.add_human_move_if_valid(start_row, start_col, start_row - offset, start_col, moves, captures)  # Up
-
-        # Diagonal moves
-        for offset in range(1, diagonal_moves_required + 1):
-            self.add_human_move_if_valid(start_row, start_col, start_row + offset, start_col + offset, moves,
-                                         captures)  # Bottom-right
-            self.add_human_move_if_valid(start_row, start_col, start_row - offset, start_col - offset, moves,
-                                         captures)  # Top-left
-            self.add_human_move_if_valid(start_row, start_col, start_row + offset, start_col - offset, moves,
-                                         captures)  # Bottom-left
-            self.add_human_move_if_valid(start_row, start_col, start_row - offset, start_col + offset, moves,
-                                         captures)  # Top-right
-
-        return moves, captures
-
-    def add_human_move_if_valid(self, start_row, start_col, end_row, end_col, moves, captures):
-        """Adds a move to the list if it's valid."""
-        if 0 <= end_row < self.board.rows and 0 <= end_col < self.board.cols:
-            is_valid, captures_list = self.validate_move(start_row, start_col, end_row, end_col)
-            start_notation = self.board.get_position_notation(start_row, start_col)
-            end_notation = self.board.get_position_notation(end_row, end_col)
+        for start, end, is_capture in self.board.legal_moves(color):
+            start_notation = self.board.get_position_notation(*start)
+            end_notation = self.board.get_position_notation(*end)
             move = f"{start_notation} to {end_notation}"
-            if is_valid:
-                if captures_list:
-                    captures.append(move)
-                else:
-                    moves.append(move)
-
-    def validate_move(self, start_row, start_col, end_row, end_col):
-        """Validates if a move is allowed and checks for captures."""
-        captures = []
-        piece = self.board.get_piece(start_row, start_col)
-        if not piece or piece.color != self.player_color:  # Only validate for pieces controlled by the human player
-            return False, captures
-
-        # Use the board's existing move validation logic
-        is_valid, message = self.board.is_valid_move(piece, end_row, end_col)
-        if is_valid:
-            target_piece = self.board.get_piece(end_row, end_col)
-            if target_piece and target_piece.color != self.player_color:
-                captures.append((end_row, end_col))
-            return True, captures
-
-        return False, captures
+            if is_capture:
+                capture_moves.append(move)
+            else:
+                possible_moves.append(move)
+
+        return possible_moves, capture_moves
@@ -0,0 +1,130 @@
+import argparse
+import struct
+from collections import namedtuple
+from board import Board, TURN_ORDER
+
+# Each game is one record: a header, one TURN_ORDER index per player, then two square bytes per move.
+# Records are appended back to back, so an archive is read by walking it from the start.
+MAGIC = b'LOAG'
+HEADER = struct.Struct('<4sBBBI')  # Magic, board size, player count, winner index, move count
+DRAW = 255  # Winner index of a drawn game
+
+GameRecord = namedtuple('GameRecord', ['board_size', 'colors', 'winner_index', 'moves'])
+GameRecord.__doc__ = """One finished game.
+
+colors holds the players' colors in turn order, winner_index indexes colors
+(None for a draw), and moves holds ((start_row, start_col), (end_row, end_col))
+per turn, or None where the player had to pass.
+"""
+
+
+def record_from_result(result):
+    """Builds a GameRecord from a headless.run_game result, restoring the passes it leaves out."""
+    colors = result['colors']
+    moves = []
+    turn = 0
+    for start_row, start_col, end_row, end_col, color, _ in result['moves']:
+        while colors[turn % len(colors)] != color:
+            moves.append(None)
+            turn += 1
+        moves.append(((start_row, start_col), (end_row, end_col)))
+        turn += 1
+    return GameRecord(result['board_size'], tuple(colors), result['winner_index'], moves)
+
+
+def encode_game(record):
+    """Packs a GameRecord into bytes; a pass is stored as a move from a square to itself."""
+    size = record.board_size
+    winner = DRAW if record.winner_index is None else record.winner_index
+    data = bytearray(HEADER.pack(MAGIC, size, len(record.colors), winner, len(record.moves)))
+    data += bytes(TURN_ORDER.index(color) for color in record.colors)
+    for move in record.moves:
+        if move is None:
+            data += b'\x00\x00'
+        else:
+            (start_row, start_col), (end_row, end_col) = move
+            data.append(start_row * size + start_col)
+            data.append(end_row * size + end_col)
+    return bytes(data)
+
+
+def append_games(path, records):
+    """Appends encoded games to an archive file, creating it if needed, and returns how many were written."""
+    count = 0
+    with open(path, 'ab') as archive:
+        for record in records:
+            archive.write(record if isinstance(record, bytes) else encode_game(record))
+            count += 1
+    return count
+
+
+def read_games(path):
+    """Yields every GameRecord in an archive, reading one game at a time."""
+    with open(path, 'rb') as archive:
+        while True:
+            header = archive.read(HEADER.size)
+            if not header:
+                return
+            if len(header) < HEADER.size:
+                raise ValueError(f"{path}: truncated game header at byte {archive.tell() - len(header)}")
+            magic, size, player_count, winner, move_count = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{path}: no game record at byte {archive.tell() - HEADER.size}")
+            body = archive.read(player_count + 2 * move_count)
+            if len(body) < player_count + 2 * move_count:
+                raise ValueError(f"{path}: truncated game record")
+            colors = tuple(TURN_ORDER[index] for index in body[:player_count])
+            moves = []
+            for offset in range(player_count, len(body), 2):
+                start, end = body[offset], body[offset + 1]
+                moves.append(None if start == end else (divmod(start, size), divmod(end, size)))
+            yield GameRecord(size, colors, None if winner == DRAW else winner, moves)
+
+
+def replay(record, validate=True):
+    """Plays a record through a fresh Board, yielding (board, move, color) after every turn.
+
+    The same Board is yielded each time; copy it to keep a position. With validate,
+    a move that is not legal in the replayed position raises ValueError.
+    """
+    board = Board(record.board_size)
+    for ply, move in enumerate(record.moves):
+        color = record.colors[ply % len(record.colors)]
+        if move is not None:
+            if validate:
+                legal = {(start, end) for start, end, _ in board.legal_moves(color)}
+                if move not in legal:
+                    raise ValueError(f"Move {ply + 1} {move} is not legal for {board.get_color_name(color)}")
+            board.make_move(move)
+        yield board, move, color
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize or check the games in an archive.")
+    parser.add_argument('archive', help="Archive written by headless.py or tournament.py --archive")
+    parser.add_argument('--replay', action='store_true', help="Replay every game to check its moves and result")
+    args = parser.parse_args()
+
+    games = 0
+    moves = 0
+    results = {}
+    for record in read_games(args.archive):
+        games += 1
+        moves += len(record.moves)
+        winner = record.colors[record.winner_index] if record.winner_index is not None else None
+        results[winner] = results.get(winner, 0) + 1
+        if args.replay:
+            board, _, color = None, None, None
+            for board, _, color in replay(record):
+                pass
+            if board is not None and winner is not None and board.get_winner(color) != winner:
+                raise SystemExit(f"Game {games}: replay does not end in the recorded result")
+
+    names = Board(8, initialize=False)
+    print(f"{games} games, {moves} moves")
+    for winner, count in results.items():
+        print(f"  {names.get_color_name(winner) if winner else 'Draw'}: {count}")
+
+
+if __name__ == "__main__":
+    main()
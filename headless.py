@@ -0,0 +1,97 @@
+import argparse
+import random
+import time
+from board import Board, TURN_ORDER
+from computerPlayer import ComputerPlayer
+from game_record import append_games, record_from_result
+from log_config import configure_logging, add_log_level_argument
+
+# Players per board size, matching the menu: 8x8 is the 2-player game, larger boards are 4-player
+PLAYERS_FOR_SIZE = {8: 2, 12: 4, 16: 4}
+
+
+def run_game(board_size=8, player_settings=None, seed=None, max_turns=1000):
+    """Plays one computer-vs-computer game without pygame and returns its result, moves and timing.
+
+    player_settings holds one dict of ComputerPlayer keyword arguments per color, in turn order
+    (Black, White, then Red and Green on 4-player boards). Missing entries play random moves.
+    The game is a draw if every player passes in a row or max_turns turns go by without a winner.
+    """
+    board = Board(board_size)
+    remaining_colors = board.get_remaining_colors()
+    colors = [color for color in TURN_ORDER if color in remaining_colors]
+    player_settings = list(player_settings or [])
+    player_settings += [{}] * (len(colors) - len(player_settings))
+    rng = random.Random(seed)
+    players = [ComputerPlayer(board, color, rng=rng, **settings) for color, settings in zip(colors, player_settings)]
+
+    moves = []  # (start_row, start_col, end_row, end_col, color, captured) per move played
+    move_times = []
+    winner = None
+    passes = 0
+    turn = 0
+    game_start = time.perf_counter()
+    while turn < max_turns:
+        player = players[turn % len(players)]
+        pieces_before = len(board.pieces)
+        move_start = time.perf_counter()
+        move = player.make_move()
+        move_times.append(time.perf_counter() - move_start)
+        turn += 1
+
+        if move is None:
+            passes += 1
+            if passes == len(players):
+                break  # Nobody can move
+            continue
+        passes = 0
+        moves.append((*move, player.color, len(board.pieces) < pieces_before))
+
+        winner = board.get_winner(player.color)
+        if winner is not None:
+            break
+
+    return {
+        'board_size': board_size,
+        'colors': colors,
+        'seed': seed,
+        'winner': winner,  # Winning color, or None for a draw
+        'winner_index': colors.index(winner) if winner is not None else None,
+        'moves': moves,
+        'turns': turn,
+        'elapsed': time.perf_counter() - game_start,
+        'move_times': move_times,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play computer-vs-computer Lines of Action games without a window.")
+    parser.add_argument('--size', type=int, choices=sorted(PLAYERS_FOR_SIZE), default=8, help="Board size")
+    parser.add_argument('--games', type=int, default=1, help="Number of games to play")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the first game; later games add one each")
+    parser.add_argument('--engine', nargs='+', default=['random'],
+                        help="Engine per color in turn order; the last one is repeated for the rest")
+    parser.add_argument('--depth', type=int, default=3, help="Alpha-beta search depth")
+    parser.add_argument('--time-limit', type=float, default=None, help="Seconds per alpha-beta move")
+    parser.add_argument('--archive', help="Append every game to this binary game archive")
+    add_log_level_argument(parser)
+    args = parser.parse_args()
+    configure_logging(args.log_level)
+
+    num_players = PLAYERS_FOR_SIZE[args.size]
+    engines = (args.engine + [args.engine[-1]] * num_players)[:num_players]
+    player_settings = [{'engine': engine, 'search_depth': args.depth, 'time_limit': args.time_limit}
+                       for engine in engines]
+
+    board = Board(args.size, initialize=False)  # Only used for color names
+    for game_number in range(args.games):
+        result = run_game(args.size, player_settings, seed=args.seed + game_number)
+        if args.archive:
+            append_games(args.archive, [record_from_result(result)])
+        winner_name = board.get_color_name(result['winner']) if result['winner'] else "Draw"
+        print(f"Game {game_number + 1}: {winner_name} after {len(result['moves'])} moves "
+              f"in {result['elapsed']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
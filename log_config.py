@@ -0,0 +1,30 @@
+import logging
+import os
+
+# Environment variable that turns logging on without a command-line flag, e.g. LOA_LOG_LEVEL=DEBUG
+LOG_LEVEL_ENV = 'LOA_LOG_LEVEL'
+LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR']
+
+logger = logging.getLogger(__name__)
+
+
+def configure_logging(level=None):
+    """Sets the log level from the argument or LOA_LOG_LEVEL; only warnings and errors show by default.
+
+    An unknown LOA_LOG_LEVEL is reported as a warning and WARNING is used instead.
+    """
+    environment_level = os.environ.get(LOG_LEVEL_ENV)
+    bad_environment_level = None
+    if level is None and environment_level:
+        level = environment_level.upper()
+        if level not in LOG_LEVELS:
+            bad_environment_level, level = environment_level, None
+    level = level.upper() if level else 'WARNING'
+    logging.basicConfig(level=level, format='%(asctime)s %(name)s %(levelname)s: %(message)s')
+    if bad_environment_level is not None:
+        logger.warning("Ignoring %s=%r, expected one of %s", LOG_LEVEL_ENV, bad_environment_level, ', '.join(LOG_LEVELS))
+
+
+def add_log_level_argument(parser):
+    parser.add_argument('--log-level', choices=LOG_LEVELS, type=str.upper,
+                        help=f"Log verbosity (default: ${LOG_LEVEL_ENV} or WARNING)")
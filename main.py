@@ -1,9 +1,22 @@
+import argparse
+import logging
 import pygame
 from game import Game
 from menu import Menu
+from log_config import configure_logging, add_log_level_argument
+
+logger = logging.getLogger(__name__)
+
+IDLE_TIMEOUT_MS = 500  # Longest an idle window sleeps before redrawing anyway
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Lines of Action")
+    parser.add_argument('--fps', type=int, default=60, help="Frame rate cap while animating or thinking")
+    add_log_level_argument(parser)
+    args = parser.parse_args()
+    configure_logging(args.log_level)
+
     pygame.init()
     window = pygame.display.set_mode((800, 800))
     pygame.display.set_caption("Lines of Action")
@@ -11,11 +24,19 @@ def main():
     menu = Menu(window)
     game = None
 
+    clock = pygame.time.Clock()
     running = True
     in_menu = True
 
     while running:
-        for event in pygame.event.get():
+        animating = menu.is_animating() if in_menu else (game is not None and game.is_busy())
+        if animating:
+            events = pygame.event.get()
+        else:
+            # Nothing changes on its own, so sleep until an event arrives instead of redrawing
+            events = [pygame.event.wait(IDLE_TIMEOUT_MS)] + pygame.event.get()
+
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left mouse button
@@ -29,21 +50,28 @@ def main():
                         game_settings = menu.start_game()
 
                     if game_settings:
-                        print(f"Starting game with settings: {game_settings}")
-                        in_menu = False
-                        game = Game(
-                            window,
-                            game_settings['num_players'],
-                            game_settings['players_type'],
-                            game_settings['player_order'],
-                            game_settings['player_colors'],
-                            game_settings['board_size'],
-                            game_settings.get('player_color'),
-                            game_settings.get('computer_color'),
-                            game_settings.get('case')  # Pass the case if it's a loaded game
-                        )
+                        logger.info("Starting game with settings: %s", game_settings)
+                        try:
+                            game = Game(
+                                window,
+                                game_settings['num_players'],
+                                game_settings['players_type'],
+                                game_settings['player_order'],
+                                game_settings['player_colors'],
+                                game_settings['board_size'],
+                                game_settings.get('player_color'),
+                                game_settings.get('computer_color'),
+                                game_settings.get('case')  # Pass the case if it's a loaded game
+                            )
+                            in_menu = False
+                        except (OSError, ValueError) as error:
+                            # A missing or malformed case file keeps the menu open to pick another
+                            logger.error("Could not load the game: %s", error)
+                            menu.selected_case = None
                 elif game:
                     game.handle_click(event.pos)
+            elif event.type == pygame.KEYDOWN and not in_menu and game:
+                game.handle_key(event.key, event.mod)
 
         if in_menu:
             menu.display()
@@ -51,7 +79,10 @@ def main():
             game.update()
 
         pygame.display.flip()
+        clock.tick(args.fps)
 
+    if game:
+        game.cancel_pending_move()  # Do not keep the process alive for a search nobody will use
     pygame.quit()
 
 
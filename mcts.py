@@ -0,0 +1,238 @@
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from board import Board, TURN_ORDER
+
+STOP_POLL_INTERVAL = 0.05  # Seconds between checks of the caller's stop_event during a root-parallel search
+
+# Process pools for root-parallel search, created on first use and kept per worker count,
+# each with the multiprocessing.Event that tells its workers' searches to stop
+process_pools = {}
+worker_stop_event = None  # That event, inside a worker process
+
+
+class Node:
+    """One position in the search tree, reached by move from its parent."""
+    __slots__ = ('move', 'mover', 'turn', 'key', 'winner', 'children', 'untried_moves', 'visits', 'reward')
+
+    def __init__(self, move, mover, turn, key, winner=None):
+        self.move = move  # (start, end, is_capture), or None for a pass and for the root
+        self.mover = mover  # Color that played move; rewards are counted from its point of view
+        self.turn = turn  # Index into the search's turn order of the color to move here
+        self.key = key  # Zobrist key with the color to move, used to find the node again next turn
+        self.winner = winner  # Winning color if the game ended with move
+        self.children = []
+        self.untried_moves = None  # Generated on the first visit
+        self.visits = 0
+        self.reward = 0.0  # Sum of playout results for mover: 1 per win, a share of 1 per draw
+
+    def best_child(self, exploration):
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.reward / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+
+class MCTSSearch:
+    """Monte Carlo tree search (UCT) for any number of colors.
+
+    Every color plays to maximize its own wins, so unlike the paranoid
+    alpha-beta search it treats 4-player games naturally. Pass the previous
+    search as reuse to continue from the part of its tree that is still
+    reachable, instead of starting from nothing.
+    """
+
+    def __init__(self, board, color, playouts=1000, time_limit=None, exploration=1.4, heuristic_playouts=True,
+                 max_playout_moves=200, rng=None, stop_event=None, reuse=None):
+        self.board = board
+        self.color = color
+        self.playouts = playouts  # Playouts per search, or None to use only the time limit
+        self.time_limit = time_limit  # Seconds of wall-clock time per search, or None
+        self.exploration = exploration  # UCT constant; higher explores more
+        self.heuristic_playouts = heuristic_playouts  # Bias playouts towards captures and compact groups
+        self.max_playout_moves = max_playout_moves  # Playouts longer than this count as draws
+        self.rng = rng if rng is not None else random
+        self.stop_event = stop_event  # threading.Event another thread can set to end the search early
+        remaining_colors = board.get_remaining_colors()
+        colors = [c for c in TURN_ORDER if c in remaining_colors]
+        if color in colors:
+            index = colors.index(color)
+            colors = colors[index:] + colors[:index]
+        self.turn_order = colors  # Starts with the searching color
+        self.root = self.reusable_root(reuse)
+        self.reused_visits = self.root.visits
+        self.completed_playouts = 0
+
+    def reusable_root(self, previous):
+        """Finds the current position in the previous search's tree, or starts a new tree."""
+        key = self.board.position_key(self.color)
+        if previous is not None and previous.turn_order == self.turn_order:
+            level = [previous.root]
+            for _ in range(len(self.turn_order) + 1):  # Our last move plus one move per opponent
+                for node in level:
+                    if node.key == key and node.turn == 0:
+                        node.move = None
+                        node.mover = None
+                        return node
+                level = [child for node in level for child in node.children]
+        return Node(None, None, 0, key)
+
+    def search(self):
+        """Returns the most visited (start, end, is_capture) move after the budget runs out, or None."""
+        deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+        if self.playouts is None and deadline is None:
+            raise ValueError("MCTS needs a playout budget, a time limit, or both.")
+        self.completed_playouts = 0
+        while self.playouts is None or self.completed_playouts < self.playouts:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if self.stop_event is not None and self.stop_event.is_set():
+                break
+            self.run_iteration()
+            self.completed_playouts += 1
+
+        moves = [child for child in self.root.children if child.move is not None]
+        if not moves:
+            return None
+        return max(moves, key=lambda child: child.visits).move
+
+    def move_statistics(self):
+        """Visits and reward of every root move searched so far, for merging parallel searches."""
+        return {child.move: (child.visits, child.reward) for child in self.root.children if child.move is not None}
+
+    def run_iteration(self):
+        """Selects a leaf, expands it by one move, plays out the rest of the game and records the result."""
+        board = self.board
+        node = self.root
+        path = [node]
+        tokens = []
+        try:
+            while node.winner is None:
+                if node.untried_moves is None:
+                    node.untried_moves = list(board.legal_moves(self.turn_order[node.turn]))
+                    if not node.untried_moves:
+                        node.untried_moves = [None]  # The only option is to pass
+                if node.untried_moves:
+                    node = self.expand(node, tokens)
+                    path.append(node)
+                    break
+                node = node.best_child(self.exploration)
+                if node.move is not None:
+                    tokens.append(board.make_move(node.move))
+                path.append(node)
+
+            if node.winner is not None:
+                winner = node.winner
+            else:
+                winner = self.playout(node.turn, tokens)
+        finally:
+            for token in reversed(tokens):
+                board.unmake_move(token)
+
+        draw_share = 1.0 / len(self.turn_order)
+        for visited in path:
+            visited.visits += 1
+            if visited.mover is not None:
+                if winner is None:
+                    visited.reward += draw_share
+                elif winner == visited.mover:
+                    visited.reward += 1.0
+
+    def expand(self, node, tokens):
+        move = node.untried_moves.pop(self.rng.randrange(len(node.untried_moves)))
+        color = self.turn_order[node.turn]
+        winner = None
+        if move is not None:
+            tokens.append(self.board.make_move(move))
+            winner = self.board.get_winner(color)
+        next_turn = (node.turn + 1) % len(self.turn_order)
+        child = Node(move, color, next_turn, self.board.position_key(self.turn_order[next_turn]), winner)
+        node.children.append(child)
+        return child
+
+    def playout(self, turn, tokens):
+        """Plays quick moves from the current position and returns the winning color, or None for a draw."""
+        board = self.board
+        passes = 0
+        for _ in range(self.max_playout_moves):
+            color = self.turn_order[turn]
+            turn = (turn + 1) % len(self.turn_order)
+            moves = list(board.legal_moves(color))
+            if not moves:
+                passes += 1
+                if passes == len(self.turn_order):
+                    return None  # Nobody can move
+                continue
+            passes = 0
+            move = self.pick_playout_move(color, moves) if self.heuristic_playouts else self.rng.choice(moves)
+            tokens.append(board.make_move(move))
+            winner = board.get_winner(color)
+            if winner is not None:
+                return winner
+        return None
+
+    def pick_playout_move(self, color, moves):
+        """Samples a few moves and keeps a capture, or else the one ending nearest the color's center of mass."""
+        candidates = [self.rng.choice(moves) for _ in range(3)]
+        for move in candidates:
+            if move[2]:
+                return move
+        pieces = self.board.get_pieces(color)
+        mean_row = sum(piece.row for piece in pieces) / len(pieces)
+        mean_col = sum(piece.col for piece in pieces) / len(pieces)
+        return min(candidates, key=lambda move: max(abs(move[1][0] - mean_row), abs(move[1][1] - mean_col))
+                   - max(abs(move[0][0] - mean_row), abs(move[0][1] - mean_col)))
+
+
+def start_worker(stop_event):
+    """Pool initializer: keeps the pool's stop event for search_position."""
+    global worker_stop_event
+    worker_stop_event = stop_event
+
+
+def search_position(task):
+    """Worker entry point: runs one independent search on a Position and returns its root move statistics."""
+    position, settings, seed = task
+    board = Board.from_position(position)
+    search = MCTSSearch(board, TURN_ORDER[position.to_move], rng=random.Random(seed), stop_event=worker_stop_event,
+                        **settings)
+    search.search()
+    return search.move_statistics()
+
+
+def root_parallel_search(board, color, workers, playouts=1000, time_limit=None, rng=None, stop_event=None,
+                         **settings):
+    """Runs one search per worker process on copies of the position and plays the move visited most in total.
+
+    The playout budget is split between the workers, while a time limit applies to each of
+    them, so more workers means more playouts in the same time. Setting stop_event ends
+    every worker's search early, and the move is chosen from what they had searched.
+    Only one search should use a pool at a time.
+    """
+    rng = rng if rng is not None else random
+    if workers not in process_pools:
+        workers_stop_event = multiprocessing.Event()
+        process_pools[workers] = (ProcessPoolExecutor(max_workers=workers, initializer=start_worker,
+                                                      initargs=(workers_stop_event,)), workers_stop_event)
+    pool, workers_stop_event = process_pools[workers]
+    position = board.to_position(color)
+    settings = dict(settings, time_limit=time_limit,
+                    playouts=-(-playouts // workers) if playouts is not None else None)
+    futures = [pool.submit(search_position, (position, settings, rng.getrandbits(32))) for _ in range(workers)]
+
+    pending = futures
+    while pending:
+        pending = wait(pending, timeout=STOP_POLL_INTERVAL).not_done
+        if pending and stop_event is not None and stop_event.is_set():
+            workers_stop_event.set()
+    workers_stop_event.clear()
+
+    totals = {}
+    for future in futures:
+        for move, (visits, reward) in future.result().items():
+            total_visits, total_reward = totals.get(move, (0, 0.0))
+            totals[move] = (total_visits + visits, total_reward + reward)
+    if not totals:
+        return None
+    return max(totals, key=lambda move: totals[move][0])
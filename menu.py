@@ -1,12 +1,14 @@
 import pygame
+from fonts import render_text
 import random
 import math
+import logging
+
+logger = logging.getLogger(__name__)
 
 class Menu:
     def __init__(self, window):
         self.window = window
-        self.font = pygame.font.SysFont('Arial', 24)
-        self.title_font = pygame.font.SysFont('Arial', 40)
         self.num_players = None  # Store the number of players
         self.players_type = []  # Store whether each player is Human or Computer
         self.board_size = None  # Store selected board size
@@ -30,7 +32,7 @@ class Menu:
         self.window.fill((240, 240, 240))
 
         # Display title
-        title_surface = self.title_font.render("Lines of Action", True, (0, 0, 0))
+        title_surface = render_text("Lines of Action", 40, (0, 0, 0))
         title_rect = title_surface.get_rect(center=(400, 100))
         self.window.blit(title_surface, title_rect)
 
@@ -47,17 +49,19 @@ class Menu:
         elif self.selection_phase == "load_game":
             self.display_load_game_cases()  # Display load game cases
 
-        pygame.display.flip()
+    def is_animating(self):
+        """Checks whether the menu changes on its own (coin flip or wheel spin) and needs redrawing every frame."""
+        return self.coin_flipping or self.is_wheel_spinning
 
     def display_num_players_selection(self):
         # Prompt to ask for number of players (2 or 4)
-        prompt_surface = self.font.render("How many players? (2 or 4)", True, (0, 0, 0))
+        prompt_surface = render_text("How many players? (2 or 4)", 24, (0, 0, 0))
         prompt_rect = prompt_surface.get_rect(center=(400, 200))
         self.window.blit(prompt_surface, prompt_rect)
 
         # Display options for players (2 or 4 players)
         for i, num in enumerate([2, 4]):
-            option_surface = self.font.render(str(num), True, (0, 0, 0))
+            option_surface = render_text(str(num), 24, (0, 0, 0))
             option_rect = pygame.Rect(300 + i * 100, 250, 50, 50)
             pygame.draw.rect(self.window, (0, 0, 255), option_rect)
             option_surface_rect = option_surface.get_rect(center=option_rect.center)
@@ -65,7 +69,7 @@ class Menu:
 
         # Display the Load Game button
         pygame.draw.rect(self.window, (0, 0, 0), self.load_game_button_rect)
-        load_game_surface = self.font.render("Load Game", True, (255, 255, 255))
+        load_game_surface = render_text("Load Game", 24, (255, 255, 255))
         load_game_surface_rect = load_game_surface.get_rect(center=self.load_game_button_rect.center)
         self.window.blit(load_game_surface, load_game_surface_rect)
 
@@ -74,20 +78,20 @@ class Menu:
         for i in range(5):
             button_rect = pygame.Rect(300, 200 + i * 60, 200, 50)
             pygame.draw.rect(self.window, (0, 0, 255), button_rect)
-            case_surface = self.font.render(f"Case {i + 1}", True, (255, 255, 255))
+            case_surface = render_text(f"Case {i + 1}", 24, (255, 255, 255))
             case_rect = case_surface.get_rect(center=button_rect.center)
             self.window.blit(case_surface, case_rect)
 
     def display_board_size_selection(self):
         # Prompt to ask for board size
-        prompt_surface = self.font.render("Select board size:", True, (0, 0, 0))
+        prompt_surface = render_text("Select board size:", 24, (0, 0, 0))
         prompt_rect = prompt_surface.get_rect(center=(400, 200))
         self.window.blit(prompt_surface, prompt_rect)
 
         # Display options for board size (8x8 only for 2 players, 12x12 or 16x16 for 4 players)
         sizes = [8, 12, 16] if self.num_players == 4 else [8]
         for i, size in enumerate(sizes):
-            option_surface = self.font.render(f"{size} x {size}", True, (0, 0, 0))
+            option_surface = render_text(f"{size} x {size}", 24, (0, 0, 0))
             option_rect = pygame.Rect(300 + i * 100, 250, 100, 50)
             pygame.draw.rect(self.window, (0, 0, 255), option_rect)
             option_surface_rect = option_surface.get_rect(center=option_rect.center)
@@ -100,7 +104,7 @@ class Menu:
             self.selection_phase = "board_size"  # Move to board size selection phase
             return
 
-        prompt_surface = self.font.render(f"Is Player {current_player} human or computer?", True, (0, 0, 0))
+        prompt_surface = render_text(f"Is Player {current_player} human or computer?", 24, (0, 0, 0))
         prompt_rect = prompt_surface.get_rect(center=(400, 200))
         self.window.blit(prompt_surface, prompt_rect)
 
@@ -111,8 +115,8 @@ class Menu:
         pygame.draw.rect(self.window, (0, 255, 0), human_button_rect)  # Green for Human
         pygame.draw.rect(self.window, (255, 0, 0), computer_button_rect)  # Red for Computer
 
-        human_surface = self.font.render("Human", True, (0, 0, 0))
-        computer_surface = self.font.render("Computer", True, (0, 0, 0))
+        human_surface = render_text("Human", 24, (0, 0, 0))
+        computer_surface = render_text("Computer", 24, (0, 0, 0))
 
         self.window.blit(human_surface, human_button_rect.move(20, 10))
         self.window.blit(computer_surface, computer_button_rect.move(10, 10))
@@ -126,15 +130,15 @@ class Menu:
             pygame.draw.rect(self.window, (0, 255, 0), heads_button_rect)
             pygame.draw.rect(self.window, (255, 0, 0), tails_button_rect)
 
-            heads_surface = self.font.render("Heads", True, (0, 0, 0))
-            tails_surface = self.font.render("Tails", True, (0, 0, 0))
+            heads_surface = render_text("Heads", 24, (0, 0, 0))
+            tails_surface = render_text("Tails", 24, (0, 0, 0))
 
             self.window.blit(heads_surface, heads_button_rect.move(10, 10))
             self.window.blit(tails_surface, tails_button_rect.move(10, 10))
         elif self.coin_flipping:
             # Simulate the coin flipping
             coin_side = random.choice(["Heads", "Tails"])
-            result_surface = self.font.render(f"Coin is flipping: {coin_side}", True, (0, 0, 0))
+            result_surface = render_text(f"Coin is flipping: {coin_side}", 24, (0, 0, 0))
             self.window.blit(result_surface, (300, 250))
             pygame.display.update()
             pygame.time.delay(300)
@@ -145,7 +149,7 @@ class Menu:
         else:
             # Show the result of the coin flip
             result_text = f"The coin landed on {self.coin_flip_result.upper()}!"
-            result_surface = self.font.render(result_text, True, (0, 0, 0))
+            result_surface = render_text(result_text, 24, (0, 0, 0))
             self.window.blit(result_surface, (300, 250))
 
             # Assign player and computer colors based on the result
@@ -159,7 +163,7 @@ class Menu:
                 self.computer_color = (0, 0, 0)  # Computer gets black
 
             # Display which color the user will play as
-            player_surface = self.font.render(player_text, True, (0, 0, 0))
+            player_surface = render_text(player_text, 24, (0, 0, 0))
             self.window.blit(player_surface, (300, 300))
 
             # Transition to the game after a short delay
@@ -169,12 +173,12 @@ class Menu:
 
     def display_wheel_spin(self):
         """Handle 4-player wheel spin."""
-        print(f"Wheel is spinning, speed: {self.spin_speed}, angle: {self.wheel_angle}")  # Debugging statement
+        logger.debug("Wheel is spinning, speed: %s, angle: %s", self.spin_speed, self.wheel_angle)
 
         if not self.is_wheel_spinning:
             spin_button_rect = pygame.Rect(350, 550, 100, 50)
             pygame.draw.rect(self.window, (0, 255, 0), spin_button_rect)
-            spin_text = self.font.render("Spin", True, (0, 0, 0))
+            spin_text = render_text("Spin", 24, (0, 0, 0))
             self.window.blit(spin_text, spin_button_rect.move(20, 10))
         else:
             # Draw the spinning wheel
@@ -189,7 +193,7 @@ class Menu:
                 if self.spin_speed < 0.1:  # Adjust this value if necessary
                     self.spin_speed = 0  # Stop the wheel when it reaches a small speed value
             else:
-                print("Wheel spin completed, determining winner...")  # Debugging statement
+                logger.debug("Wheel spin completed, determining winner...")
                 self.is_wheel_spinning = False
                 self.determine_winner()  # Determine who goes first and assign colors
 
@@ -208,7 +212,7 @@ class Menu:
                                 self.get_wheel_section_points(start_angle, end_angle))
 
             # Display player numbers on each section
-            text_surface = self.font.render(section_labels[i], True, (0, 0, 0))
+            text_surface = render_text(section_labels[i], 24, (0, 0, 0))
             text_rect = text_surface.get_rect(center=self.get_wheel_section_center(start_angle, end_angle))
             self.window.blit(text_surface, text_rect)
 
@@ -241,11 +245,11 @@ class Menu:
         pygame.draw.polygon(self.window, (255, 0, 0), arrow_points)
 
     def determine_winner(self):
-        print("Determining player colors based on wheel spin...")
+        logger.debug("Determining player colors based on wheel spin...")
 
         section = int(self.wheel_angle % 360 // (360 // 4)) + 1
         self.winner = section
-        print(f"Wheel stopped at section: {section}")  # Debugging the wheel outcome
+        logger.debug("Wheel stopped at section: %s", section)
 
         # Assign players to colors based on the result of the spin
         if self.winner == 1:
@@ -257,11 +261,11 @@ class Menu:
         elif self.winner == 4:
             self.player_colors = {4: (0, 0, 0), 1: (255, 255, 255), 2: (255, 0, 0), 3: (0, 255, 0)}
 
-        print(f"Player colors assigned: {self.player_colors}")  # Debugging player color assignment
+        logger.debug("Player colors assigned: %s", self.player_colors)
 
         # Transition to the game
         pygame.time.wait(2000)
-        print("Transitioning to game...")  # Debugging transition flag
+        logger.debug("Transitioning to game...")
         self.transition_to_game = True
 
     def handle_click(self, pos):
@@ -289,7 +293,7 @@ class Menu:
             if button_rect.collidepoint(pos):
                 # Store the selected case number
                 self.selected_case = i + 1
-                print(f"Load Game: Case {self.selected_case} selected")  # For debugging
+                logger.debug("Load Game: Case %s selected", self.selected_case)
                 self.transition_to_game = True  # Transition to the game
 
     def handle_wheel_spin_click(self, pos):
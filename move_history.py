@@ -0,0 +1,104 @@
+from collections import namedtuple
+
+MoveRecord = namedtuple('MoveRecord', ['start', 'end', 'color', 'captured', 'key', 'turn', 'player_number'])
+MoveRecord.__doc__ = """One turn of a game.
+
+start and end are (row, col) squares, both None for a pass. key is the board's
+Zobrist hash after the move, turn the Game.current_turn of the player who moved,
+and player_number the number shown for that player.
+"""
+
+
+class MoveHistory:
+    """Moves played on a board, with undo, redo and jumping to any ply.
+
+    Moves are played through Board.make_move, so going back and forth only
+    unmakes or remakes the moves in between. Playing a new move after an undo
+    drops the moves that could have been redone. Text lines are only built
+    when asked for, and then kept.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.records = []  # Every recorded move, including undone ones that can be redone
+        self.tokens = []  # make_move token of each ply currently on the board, None for passes
+        self.texts = []  # Text line of each record, None until first asked for
+        self.ply = 0  # Number of records currently applied to the board
+
+    def __len__(self):
+        return len(self.records)
+
+    def play(self, start, end, turn, player_number):
+        """Plays a legal move on the board and records it; returns the MoveRecord."""
+        self.truncate()
+        color = self.board.get_piece(*start).color
+        captured = self.board.get_piece(*end) is not None
+        self.tokens.append(self.board.make_move((start, end)))
+        return self.append(MoveRecord(start, end, color, captured, self.board.zobrist_hash, turn, player_number))
+
+    def record_pass(self, color, turn, player_number):
+        """Records a turn in which the player could not move."""
+        self.truncate()
+        self.tokens.append(None)
+        return self.append(MoveRecord(None, None, color, False, self.board.zobrist_hash, turn, player_number))
+
+    def truncate(self):
+        del self.records[self.ply:]
+        del self.texts[self.ply:]
+
+    def append(self, record):
+        self.records.append(record)
+        self.texts.append(None)
+        self.ply += 1
+        return record
+
+    def can_undo(self):
+        return self.ply > 0
+
+    def can_redo(self):
+        return self.ply < len(self.records)
+
+    def undo(self):
+        """Takes back the last applied move and returns its record, or None at the start."""
+        if not self.can_undo():
+            return None
+        token = self.tokens.pop()
+        if token is not None:
+            self.board.unmake_move(token)
+        self.ply -= 1
+        return self.records[self.ply]
+
+    def redo(self):
+        """Plays the next undone move again and returns its record, or None if there is none."""
+        if not self.can_redo():
+            return None
+        record = self.records[self.ply]
+        self.tokens.append(self.board.make_move((record.start, record.end)) if record.start is not None else None)
+        self.ply += 1
+        return record
+
+    def jump_to(self, ply):
+        """Undoes or redoes moves until ply moves are applied."""
+        ply = max(0, min(ply, len(self.records)))
+        while self.ply > ply:
+            self.undo()
+        while self.ply < ply:
+            self.redo()
+
+    def text(self, index):
+        """Describes a record, e.g. "Player 1 (Black) moved B1 to B3"."""
+        if self.texts[index] is None:
+            record = self.records[index]
+            player = f"Player {record.player_number} ({self.board.get_color_name(record.color)})"
+            if record.start is None:
+                self.texts[index] = f"{player} passed"
+            else:
+                start_notation = self.board.get_position_notation(*record.start)
+                end_notation = self.board.get_position_notation(*record.end)
+                self.texts[index] = f"{player} moved {start_notation} to {end_notation}"
+        return self.texts[index]
+
+    def lines(self, start=0, stop=None):
+        """Text of the applied records from start up to stop."""
+        stop = self.ply if stop is None else min(stop, self.ply)
+        return [self.text(index) for index in range(start, stop)]
@@ -0,0 +1,145 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from board import Board, TURN_ORDER
+from search import AlphaBetaSearch
+
+# File layout: a header, then fixed-size records sorted by position key so lookups can binary search
+MAGIC = b'LOAB'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI')  # Magic, version, board size, record count
+RECORD = struct.Struct('<QBBH')  # Position key, from square, to square, search depth behind the move
+
+# Books opened in this process, by path, so every player shares one mapping
+open_books = {}
+
+
+class OpeningBook:
+    """Read-only, memory-mapped opening book; lookups binary search the sorted records."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as book_file:
+            self.data = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.board_size, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} opening book.")
+        if len(self.data) != HEADER.size + self.count * RECORD.size:
+            raise ValueError(f"{path} is truncated or has trailing data.")
+
+    def __len__(self):
+        return self.count
+
+    def lookup(self, key):
+        """Returns (from_square, to_square) stored for a position key, or None."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record_key = struct.unpack_from('<Q', self.data, HEADER.size + middle * RECORD.size)[0]
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                _, from_square, to_square, _ = RECORD.unpack_from(self.data, HEADER.size + middle * RECORD.size)
+                return from_square, to_square
+        return None
+
+    def book_move(self, board, color):
+        """Returns the book's (start, end, is_capture) move for color on board, or None if it has none."""
+        if board.rows != self.board_size:
+            return None
+        entry = self.lookup(board.position_key(color))
+        if entry is None:
+            return None
+        start, end = divmod(entry[0], board.cols), divmod(entry[1], board.cols)
+        for move in board.legal_moves(color):
+            if move[0] == start and move[1] == end:
+                return move
+        return None  # Only possible after a key collision
+
+    def close(self):
+        self.data.close()
+
+
+def load_book(path):
+    """Opens a book once per process and returns the shared OpeningBook."""
+    book = open_books.get(path)
+    if book is None:
+        book = open_books[path] = OpeningBook(path)
+    return book
+
+
+def write_book(path, board_size, entries):
+    """Writes {key: (from_square, to_square, depth)} as a sorted book file."""
+    with open(path, 'wb') as book_file:
+        book_file.write(HEADER.pack(MAGIC, VERSION, board_size, len(entries)))
+        for key in sorted(entries):
+            book_file.write(RECORD.pack(key, *entries[key]))
+
+
+def search_position(task):
+    """Worker entry point: searches one Position and returns its key with the best move found."""
+    position, search_depth, time_limit = task
+    board = Board.from_position(position)
+    color = TURN_ORDER[position.to_move]
+    search = AlphaBetaSearch(board, color, search_depth, time_limit)
+    return board.position_key(color), search.search(), search.completed_depth
+
+
+def build_book(board_size=8, plies=3, branch_plies=1, search_depth=4, time_limit=None, jobs=None):
+    """Searches the positions reachable from the start and returns {key: (from_square, to_square, depth)}.
+
+    Every reply is followed for the first branch_plies moves; after that only the
+    book's own choice is followed, up to plies moves from the start.
+    """
+    board = Board(board_size)
+    remaining_colors = board.get_remaining_colors()
+    colors = [color for color in TURN_ORDER if color in remaining_colors]
+    entries = {}
+    level = [board.to_position(colors[0])]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for ply in range(plies):
+            tasks = [(position, search_depth, time_limit) for position in level]
+            next_level = {}
+            for position, (key, move, depth) in zip(level, executor.map(search_position, tasks)):
+                if move is None:
+                    continue
+                entries[key] = (move[0][0] * board_size + move[0][1], move[1][0] * board_size + move[1][1], depth)
+                position_board = Board.from_position(position)
+                color = TURN_ORDER[position.to_move]
+                next_color = colors[(colors.index(color) + 1) % len(colors)]
+                followed = list(position_board.legal_moves(color)) if ply < branch_plies else [move]
+                for followed_move in followed:
+                    token = position_board.make_move(followed_move)
+                    if position_board.get_winner(color) is None:
+                        next_key = position_board.position_key(next_color)
+                        if next_key not in entries:
+                            next_level[next_key] = position_board.to_position(next_color)
+                    position_board.unmake_move(token)
+            level = list(next_level.values())
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an opening book by searching the positions after the start.")
+    parser.add_argument('--size', type=int, choices=[8, 12, 16], default=8, help="Board size")
+    parser.add_argument('--plies', type=int, default=3, help="Moves from the start covered by the book")
+    parser.add_argument('--branch-plies', type=int, default=1, help="Moves for which every reply is covered")
+    parser.add_argument('--depth', type=int, default=4, help="Alpha-beta search depth per position")
+    parser.add_argument('--time-limit', type=float, default=None, help="Seconds per position")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument('--output', default='opening_book.bin', help="Book file to write")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    entries = build_book(args.size, args.plies, args.branch_plies, args.depth, args.time_limit, args.jobs)
+    write_book(args.output, args.size, entries)
+    print(f"Wrote {len(entries)} positions to {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
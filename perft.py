@@ -0,0 +1,130 @@
+import argparse
+import time
+from board import Board, TURN_ORDER
+
+# Leaf counts from the start positions, by board size then depth. Depths 1-4 were checked with --verify;
+# the depth 5 counts come from legal_moves alone, since verifying them by brute force takes too long.
+REFERENCE_COUNTS = {
+    8: {1: 36, 2: 1244, 3: 44952, 4: 1563208},
+    12: {1: 18, 2: 323, 3: 5904, 4: 107404, 5: 2297423},
+    16: {1: 18, 2: 324, 3: 6372, 4: 124958, 5: 2899207},
+}
+
+
+def turn_colors(board):
+    """Colors on the board, in the order they move."""
+    remaining_colors = board.get_remaining_colors()
+    return [color for color in TURN_ORDER if color in remaining_colors]
+
+
+def brute_force_moves(board, color):
+    """Every (start, end, is_capture) move of color found by trying is_valid_move on each square."""
+    moves = set()
+    for piece in board.get_pieces(color):
+        for row in range(board.rows):
+            for col in range(board.cols):
+                if board.is_valid_move(piece, row, col)[0]:
+                    moves.add(((piece.row, piece.col), (row, col), board.get_piece(row, col) is not None))
+    return moves
+
+
+def checked_moves(board, color, verify):
+    """legal_moves of color as a list; with verify, compared against brute_force_moves first."""
+    moves = list(board.legal_moves(color))
+    if verify:
+        expected = brute_force_moves(board, color)
+        if set(moves) != expected or len(moves) != len(expected):
+            raise AssertionError(f"legal_moves disagrees with is_valid_move for {board.get_color_name(color)}: "
+                                 f"missing {sorted(expected - set(moves))}, extra {sorted(set(moves) - expected)}")
+    return moves
+
+
+def perft(board, depth, colors=None, turn=0, verify=False, stop_at_wins=True):
+    """Counts the move sequences of length depth, with colors moving in turn starting at colors[turn].
+
+    A color without a legal move passes, which counts as a single move. With stop_at_wins, a
+    move that wins the game ends its sequence early, so nothing below it is counted. With verify,
+    every position's legal_moves is compared against brute_force_moves and a mismatch raises AssertionError.
+    Depth 0 counts the position itself, once.
+    """
+    if depth <= 0:
+        return 1
+    colors = colors or turn_colors(board)
+    color = colors[turn % len(colors)]
+    moves = checked_moves(board, color, verify)
+    if not moves:
+        return perft(board, depth - 1, colors, turn + 1, verify, stop_at_wins) if depth > 1 else 1
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        token = board.make_move(move)
+        if not (stop_at_wins and board.get_winner(color) is not None):
+            nodes += perft(board, depth - 1, colors, turn + 1, verify, stop_at_wins)
+        board.unmake_move(token)
+    return nodes
+
+
+def divide(board, depth, colors=None, turn=0, verify=False, stop_at_wins=True):
+    """perft split by the first move: a dict of (start, end, is_capture), or None for a pass, to the count below it."""
+    if depth < 1:
+        raise ValueError("divide needs a depth of at least 1.")
+    colors = colors or turn_colors(board)
+    color = colors[turn % len(colors)]
+    moves = checked_moves(board, color, verify)
+    if not moves:
+        return {None: perft(board, depth - 1, colors, turn + 1, verify, stop_at_wins) if depth > 1 else 1}
+
+    counts = {}
+    for move in moves:
+        if depth == 1:
+            counts[move] = 1
+            continue
+        token = board.make_move(move)
+        if stop_at_wins and board.get_winner(color) is not None:
+            counts[move] = 0
+        else:
+            counts[move] = perft(board, depth - 1, colors, turn + 1, verify, stop_at_wins)
+        board.unmake_move(token)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count move sequences from the start position to check and time move generation.")
+    parser.add_argument('--size', type=int, choices=sorted(REFERENCE_COUNTS), default=8, help="Board size")
+    parser.add_argument('--depth', type=int, default=3, help="Moves to look ahead")
+    parser.add_argument('--divide', action='store_true', help="Print the count below each first move")
+    parser.add_argument('--verify', action='store_true',
+                        help="Check legal_moves against is_valid_move at every position (slow)")
+    parser.add_argument('--through-wins', action='store_true',
+                        help="Keep counting below moves that win the game instead of stopping there")
+    args = parser.parse_args()
+    if args.depth < 1:
+        parser.error("--depth must be at least 1")
+
+    board = Board(args.size)
+    start = time.perf_counter()
+    if args.divide:
+        counts = divide(board, args.depth, verify=args.verify, stop_at_wins=not args.through_wins)
+        for move, count in sorted(counts.items()):
+            if move is None:
+                print(f"pass: {count}")
+                continue
+            start_square, end_square, is_capture = move
+            print(f"{board.get_position_notation(*start_square)}{'x' if is_capture else '-'}"
+                  f"{board.get_position_notation(*end_square)}: {count}")
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(board, args.depth, verify=args.verify, stop_at_wins=not args.through_wins)
+    elapsed = time.perf_counter() - start
+
+    print(f"perft({args.depth}) on {args.size}x{args.size}: {nodes} nodes in {elapsed:.2f}s "
+          f"({nodes / max(elapsed, 1e-9):,.0f} nodes/sec)")
+    expected = REFERENCE_COUNTS[args.size].get(args.depth)
+    if expected is not None and nodes != expected:
+        raise SystemExit(f"Mismatch: expected {expected} nodes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,15 @@
 # piece.py
 
-import pygame
-
 class Piece:
+    __slots__ = ('row', 'col', 'color')  # Many pieces are created, so skip the per-instance __dict__
+
     def __init__(self, row, col, color):
         self.row = row
         self.col = col
         self.color = color
 
     def draw(self, window, grid_size, offset=0):
+        import pygame  # Imported here so headless code can use Piece without pygame
         radius = grid_size // 2 - 10
         center = (self.col * grid_size + grid_size // 2 + offset, self.row * grid_size + grid_size // 2 + offset)
         pygame.draw.circle(window, self.color, center, radius)
@@ -0,0 +1,11 @@
+from collections import namedtuple
+
+
+class Position(namedtuple('Position', ['size', 'masks', 'to_move'])):
+    """Immutable, hashable snapshot of a board that pickles to a few integers.
+
+    size is the board width, masks holds one bitboard per color in TURN_ORDER
+    (bit row * size + col), and to_move is the TURN_ORDER index of the color
+    to move, or None when it does not matter.
+    """
+    __slots__ = ()
@@ -0,0 +1,236 @@
+import glob
+import logging
+import os
+import re
+from collections import namedtuple
+from board import Board, TURN_ORDER
+
+logger = logging.getLogger(__name__)
+
+# Piece symbols used on the board lines of a saved game, and the color names used elsewhere
+SYMBOL_COLORS = {'B': (0, 0, 0), 'W': (255, 255, 255), 'R': (255, 0, 0), 'G': (0, 255, 0)}
+COLOR_SYMBOLS = {color: symbol for symbol, color in SYMBOL_COLORS.items()}
+NAME_COLORS = {'Black': (0, 0, 0), 'White': (255, 255, 255), 'Red': (255, 0, 0), 'Green': (0, 255, 0)}
+COLOR_NAMES = {color: name for name, color in NAME_COLORS.items()}
+
+PLAYER_COLOR_LINE = re.compile(r'Player (\d+) Color')
+CURRENT_TURN_VALUE = re.compile(r'Player (\d+)')
+MOVE_LINE = re.compile(r'Player (\d+) \((\w+)\) (?:moved ([A-Z])(\d+) to ([A-Z])(\d+)|passed)')
+
+SavedGame = namedtuple('SavedGame', ['board_size', 'pieces', 'player_colors', 'moves', 'current_turn',
+                                     'next_player', 'next_color'])
+SavedGame.__doc__ = """Contents of a saved game or game case file.
+
+pieces holds (row, col, color) for every piece. player_colors lists each player's
+color by player number, and moves holds (player_number, color, start, end) per
+history line, with start and end None for a pass. current_turn is the 0-based
+player whose turn it is. next_player ('Human' or 'Computer') and next_color come
+from game case files. Fields a file does not contain are empty or None.
+"""
+
+
+def notation_to_square(column_letter, row_number, board_size):
+    """Inverse of Board.get_position_notation."""
+    return board_size - int(row_number), ord(column_letter) - 65
+
+
+def parse_saved_game(text, source='<saved game>'):
+    """Parses the text written by Game.save_game_state or a game case file; raises ValueError on bad input."""
+    lines = text.splitlines()
+    index = 0
+    while index < len(lines) and not lines[index].strip():
+        index += 1
+    if index < len(lines) and not all(len(token) == 1 for token in lines[index].split()):
+        index += 1  # Title line such as "Board:"
+
+    def error(line_index, message):
+        return ValueError(f"{source}:{line_index + 1}: {message}")
+
+    pieces = []
+    board_rows = 0
+    while index < len(lines):
+        tokens = lines[index].split()
+        if not tokens or not all(len(token) == 1 for token in tokens):
+            break
+        for col, token in enumerate(tokens):
+            symbol = token.upper()
+            if symbol in SYMBOL_COLORS:
+                pieces.append((board_rows, col, SYMBOL_COLORS[symbol]))
+            elif symbol != '.':
+                raise error(index, f"unknown piece symbol {token!r}")
+        if board_rows and len(tokens) != first_row_length:
+            raise error(index, f"row has {len(tokens)} squares, the first row has {first_row_length}")
+        first_row_length = len(tokens)
+        board_rows += 1
+        index += 1
+
+    if not board_rows:
+        raise error(index, "no board found")
+    if board_rows != first_row_length:
+        raise error(index - 1, f"board is {board_rows} rows by {first_row_length} columns, it must be square")
+    if board_rows * board_rows > 256:
+        raise error(index - 1, f"{board_rows}x{board_rows} is larger than the biggest supported board, 16x16")
+
+    player_colors = {}
+    moves = []
+    current_turn = None
+    next_player = None
+    next_color = None
+    in_move_history = False
+    for line_index in range(index, len(lines)):
+        line = lines[line_index].strip()
+        if not line:
+            in_move_history = False
+            continue
+        if line == 'Players:':
+            continue
+        if line == 'Move History:':
+            in_move_history = True
+            continue
+        if in_move_history and not line.startswith('Current Turn:'):
+            match = MOVE_LINE.fullmatch(line)
+            if not match or match.group(2) not in NAME_COLORS:
+                raise error(line_index, f"unrecognized move {line!r}")
+            start = end = None
+            if match.group(3):
+                start = notation_to_square(match.group(3), match.group(4), board_rows)
+                end = notation_to_square(match.group(5), match.group(6), board_rows)
+                if not all(0 <= value < board_rows for value in start + end):
+                    raise error(line_index, f"move {line!r} leaves the board")
+            moves.append((int(match.group(1)), NAME_COLORS[match.group(2)], start, end))
+            continue
+
+        key, separator, value = line.partition(':')
+        value = value.strip()
+        player_match = PLAYER_COLOR_LINE.fullmatch(key)
+        if not separator:
+            raise error(line_index, f"unexpected line {line!r}")
+        if player_match:
+            if value not in NAME_COLORS:
+                raise error(line_index, f"unknown color {value!r}")
+            player_colors[int(player_match.group(1))] = NAME_COLORS[value]
+        elif key == 'Current Turn':
+            turn_match = CURRENT_TURN_VALUE.fullmatch(value)
+            if not turn_match or int(turn_match.group(1)) < 1:
+                raise error(line_index, f"unrecognized turn {value!r}")
+            current_turn = int(turn_match.group(1)) - 1
+        elif value in ('Human', 'Computer'):
+            next_player = value
+        elif value in NAME_COLORS:
+            next_color = NAME_COLORS[value]
+        else:
+            raise error(line_index, f"unexpected line {line!r}")
+
+    if player_colors and sorted(player_colors) != list(range(1, len(player_colors) + 1)):
+        raise ValueError(f"{source}: players must be numbered 1 to {len(player_colors)}")
+    if len(set(player_colors.values())) != len(player_colors):
+        raise ValueError(f"{source}: two players have the same color")
+    if player_colors and current_turn is not None and current_turn >= len(player_colors):
+        raise ValueError(f"{source}: it is player {current_turn + 1}'s turn, but there are {len(player_colors)} players")
+
+    return SavedGame(board_rows, tuple(pieces), tuple(player_colors[number] for number in sorted(player_colors)),
+                     moves, current_turn, next_player, next_color)
+
+
+def format_saved_game(saved):
+    """Writes a SavedGame in the text format parse_saved_game reads."""
+    grid = [['.'] * saved.board_size for _ in range(saved.board_size)]
+    for row, col, color in saved.pieces:
+        grid[row][col] = COLOR_SYMBOLS[color]
+    lines = ["Board:"]
+    lines += [''.join(symbol + ' ' for symbol in row) for row in grid]
+    if saved.player_colors:
+        lines += ["", "Players:"]
+        lines += [f"Player {number} Color: {COLOR_NAMES[color]}" for number, color in enumerate(saved.player_colors, 1)]
+    if saved.next_player is not None:
+        lines.append(f"Next Player: {saved.next_player}")
+    if saved.next_color is not None:
+        lines.append(f"Next Color: {COLOR_NAMES[saved.next_color]}")
+    lines += ["", "Move History:"]
+    for player_number, color, start, end in saved.moves:
+        player = f"Player {player_number} ({COLOR_NAMES[color]})"
+        if start is None:
+            lines.append(f"{player} passed")
+        else:
+            start_notation = f"{chr(65 + start[1])}{saved.board_size - start[0]}"
+            end_notation = f"{chr(65 + end[1])}{saved.board_size - end[0]}"
+            lines.append(f"{player} moved {start_notation} to {end_notation}")
+    if saved.current_turn is not None:
+        lines += ["", f"Current Turn: Player {saved.current_turn + 1}"]
+    return '\n'.join(lines) + '\n'
+
+
+def load_saved_game(path):
+    with open(path) as saved_file:
+        return parse_saved_game(saved_file.read(), path)
+
+
+def save_saved_game(path, saved):
+    with open(path, 'w') as saved_file:
+        saved_file.write(format_saved_game(saved))
+
+
+def case_number(path):
+    """Sort key putting game_case_2.txt before game_case_10.txt."""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', os.path.basename(path))]
+
+
+def load_directory(directory, pattern='game_case_*.txt', skip_invalid=False):
+    """Parses every matching file in a directory and returns {path: SavedGame} in case order.
+
+    With skip_invalid, files that fail to parse are logged and left out instead of raising.
+    """
+    saved_games = {}
+    for path in sorted(glob.glob(os.path.join(directory, pattern)), key=case_number):
+        try:
+            saved_games[path] = load_saved_game(path)
+        except ValueError as error:
+            if not skip_invalid:
+                raise
+            logger.warning("Skipping %s", error)
+    return saved_games
+
+
+def build_board(saved):
+    """Returns a Board holding the saved pieces."""
+    board = Board(saved.board_size, initialize=False)
+    for row, col, color in saved.pieces:
+        board.set_piece(row, col, color)
+    return board
+
+
+def player_colors(saved):
+    """Each player's color by player number, as a tuple.
+
+    Four-player saves from before the Players: section existed only have a
+    Current Turn: line. For those, the colors come from the move history, and
+    players that have not moved yet get the other colors on the board in turn
+    order, Black first. Returns () if that does not give every player a color.
+    """
+    if saved.player_colors or saved.current_turn is None:
+        return saved.player_colors
+    moved = {}
+    for player_number, color, _, _ in saved.moves:
+        if moved.setdefault(player_number, color) != color:
+            return ()
+    board_colors = {color for _, _, color in saved.pieces}
+    unused = [color for color in TURN_ORDER if color in board_colors and color not in moved.values()]
+    colors = []
+    for player_number in range(1, max([len(board_colors), saved.current_turn + 1, *moved]) + 1):
+        if player_number in moved:
+            colors.append(moved[player_number])
+        elif unused:
+            colors.append(unused.pop(0))
+        else:
+            return ()
+    if len(colors) < 2 or len(set(colors)) != len(colors):
+        return ()
+    return tuple(colors)
+
+
+def color_to_move(saved):
+    """Color of the player whose turn it is, or None if the file does not say."""
+    colors = player_colors(saved)
+    if colors and saved.current_turn is not None:
+        return colors[saved.current_turn]
+    return saved.next_color
@@ -0,0 +1,179 @@
+import time
+from board import TURN_ORDER
+from evaluation import evaluate_board
+from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+WIN_SCORE = 1000000  # Larger than any static evaluation
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time or node budget runs out."""
+
+
+class AlphaBetaSearch:
+    """Iterative deepening alpha-beta search over Board.make_move/unmake_move.
+
+    With more than two colors on the board the search is "paranoid": the
+    searching color maximizes and every other color minimizes its score.
+    Scores in the transposition table are from the searching color's point
+    of view, so a table should only be shared between searches for one color.
+    """
+
+    def __init__(self, board, color, max_depth=3, time_limit=None, node_limit=None, transposition_table=None,
+                 stop_event=None):
+        self.board = board
+        self.color = color
+        self.max_depth = max_depth
+        self.time_limit = time_limit  # Seconds of wall-clock time per search, or None
+        self.node_limit = node_limit  # Nodes visited per search, or None
+        self.stop_event = stop_event  # threading.Event another thread can set to end the search early
+        remaining_colors = board.get_remaining_colors()
+        colors = [c for c in TURN_ORDER if c in remaining_colors]
+        if color in colors:
+            index = colors.index(color)
+            colors = colors[index:] + colors[:index]
+        self.turn_order = colors  # Starts with the searching color
+        self.transposition_table = transposition_table if transposition_table is not None else TranspositionTable()
+        self.nodes = 0
+        self.completed_depth = 0
+        self.deadline = None
+
+    def search(self):
+        """Returns the best (start, end, is_capture) move found within the budget, or None."""
+        self.nodes = 0
+        self.completed_depth = 0
+        self.deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+        self.transposition_table.new_search()
+
+        moves = self.order_moves(list(self.board.legal_moves(self.color)))
+        if not moves:
+            return None
+        best_move = moves[0]
+
+        try:
+            for depth in range(1, self.max_depth + 1):
+                best_score, depth_best_move = self.search_root(moves, depth)
+                best_move = depth_best_move
+                self.completed_depth = depth
+                # Search the previous best move first on the next iteration
+                moves.remove(best_move)
+                moves.insert(0, best_move)
+                if best_score >= WIN_SCORE:
+                    break  # A forced win has been found
+        except SearchTimeout:
+            pass  # Keep the move from the last fully searched depth
+
+        return best_move
+
+    def search_root(self, moves, depth):
+        alpha, beta = -WIN_SCORE * 2, WIN_SCORE * 2
+        best_move = moves[0]
+        for move in moves:
+            token = self.board.make_move(move)
+            try:
+                score = self.alphabeta(depth - 1, alpha, beta, 1 % len(self.turn_order), self.color)
+            finally:
+                self.board.unmake_move(token)
+            if score > alpha:
+                alpha = score
+                best_move = move
+        return alpha, best_move
+
+    def alphabeta(self, depth, alpha, beta, turn, last_mover):
+        self.nodes += 1
+        if self.nodes & 255 == 0:
+            self.check_limits()
+
+        winner = self.board.get_winner(last_mover)
+        if winner is not None:
+            # Prefer faster wins and slower losses
+            return WIN_SCORE + depth if winner == self.color else -WIN_SCORE - depth
+        if depth == 0:
+            return evaluate(self.board, self.color, self.turn_order)
+
+        color = self.turn_order[turn]
+        next_turn = (turn + 1) % len(self.turn_order)
+        moves = self.order_moves(list(self.board.legal_moves(color)))
+        if not moves:
+            return self.alphabeta(depth - 1, alpha, beta, next_turn, None)  # The player passes
+
+        key = self.board.position_key(color)
+        entry = self.transposition_table.probe(key)
+        if entry is not None:
+            _, entry_depth, entry_score, entry_flag, entry_move, _ = entry
+            if entry_depth >= depth:
+                if entry_flag == EXACT:
+                    return entry_score
+                if entry_flag == LOWER_BOUND and entry_score >= beta:
+                    return entry_score
+                if entry_flag == UPPER_BOUND and entry_score <= alpha:
+                    return entry_score
+            if entry_move in moves:
+                moves.remove(entry_move)
+                moves.insert(0, entry_move)  # Try the stored best move first
+
+        original_alpha, original_beta = alpha, beta
+        best_move = moves[0]
+        if color == self.color:
+            for move in moves:
+                token = self.board.make_move(move)
+                try:
+                    score = self.alphabeta(depth - 1, alpha, beta, next_turn, color)
+                finally:
+                    self.board.unmake_move(token)
+                if score > alpha:
+                    alpha = score
+                    best_move = move
+                    if alpha >= beta:
+                        break
+            if alpha >= beta:
+                flag = LOWER_BOUND
+            elif alpha > original_alpha:
+                flag = EXACT
+            else:
+                flag = UPPER_BOUND
+            self.transposition_table.store(key, depth, alpha, flag, best_move)
+            return alpha
+
+        for move in moves:
+            token = self.board.make_move(move)
+            try:
+                score = self.alphabeta(depth - 1, alpha, beta, next_turn, color)
+            finally:
+                self.board.unmake_move(token)
+            if score < beta:
+                beta = score
+                best_move = move
+                if alpha >= beta:
+                    break
+        if beta <= alpha:
+            flag = UPPER_BOUND
+        elif beta < original_beta:
+            flag = EXACT
+        else:
+            flag = LOWER_BOUND
+        self.transposition_table.store(key, depth, beta, flag, best_move)
+        return beta
+
+    def check_limits(self):
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchTimeout()
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchTimeout()
+
+    @staticmethod
+    def order_moves(moves):
+        """Puts captures first, keeping generation order otherwise."""
+        moves.sort(key=lambda move: not move[2])
+        return moves
+
+
+def evaluate(board, color, turn_order):
+    """Static score of the position from color's point of view, on the evaluation module's features and WEIGHTS.
+
+    Mobility is left out: counting every legal move of every color at every leaf
+    makes the search several times slower.
+    """
+    return int(100 * evaluate_board(board, color, turn_order, mobility=False))
@@ -0,0 +1,406 @@
+import argparse
+import functools
+import itertools
+import math
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from board import Board, TURN_ORDER
+
+# Results for the side to move, two bits per position
+DRAW, WIN, LOSS, INVALID = 0, 1, 2, 3
+
+MAGIC = b'LOAT'
+VERSION = 1
+HEADER = struct.Struct('<4sHBBB')  # Magic, version, board size, mover pieces, opponent pieces
+
+CHUNK_SIZE = 1 << 16  # Positions per worker task when generating
+MAX_WIN_SEARCH = 6  # Own moves searched when choosing between winning moves, so wins make progress
+
+# Tablebases opened in this process, by (directory, board size)
+open_tablebases = {}
+
+
+def table_path(directory, size, signature):
+    """File of the table for (mover pieces, opponent pieces) on a size x size board."""
+    return os.path.join(directory, f"loa_{size}x{size}_{signature[0]}v{signature[1]}.tb")
+
+
+def colex_rank(mask):
+    """Rank of the set of squares in mask among all sets of the same size, in colexicographic order."""
+    rank = 0
+    count = 0
+    while mask:
+        low_bit = mask & -mask
+        mask ^= low_bit
+        count += 1
+        rank += math.comb(low_bit.bit_length() - 1, count)
+    return rank
+
+
+def table_index(mover_mask, opponent_mask, squares, opponent_count):
+    """Position of a (mover, opponent) pair of piece sets in its table."""
+    return colex_rank(mover_mask) * math.comb(squares, opponent_count) + colex_rank(opponent_mask)
+
+
+def table_entries(squares, signature):
+    return math.comb(squares, signature[0]) * math.comb(squares, signature[1])
+
+
+@functools.lru_cache(maxsize=None)
+def colex_sets(squares, count):
+    """Every mask of count squares, in colex rank order, so the mask of rank r is at index r."""
+    combinations = sorted(itertools.combinations(range(squares), count), key=lambda combination: combination[::-1])
+    return [sum(1 << square for square in combination) for combination in combinations]
+
+
+def set_position(board, mover, mover_mask, opponent, opponent_mask):
+    """Replaces the pieces on board with the two piece sets."""
+    board.clear_board()
+    for color, mask in ((mover, mover_mask), (opponent, opponent_mask)):
+        while mask:
+            low_bit = mask & -mask
+            mask ^= low_bit
+            board.set_piece(*divmod(low_bit.bit_length() - 1, board.cols), color)
+
+
+class Tablebase:
+    """Read-only access to solved tables, each memory-mapped on first use.
+
+    Tables are stored from the point of view of the side to move, so one table
+    serves both colors: the table for 2v3 answers Black to move with two Black
+    and three White pieces, and White to move with two White and three Black.
+    """
+
+    def __init__(self, directory, size=8):
+        self.directory = directory
+        self.size = size
+        self.tables = {}  # (mover pieces, opponent pieces) -> mmap, or None if there is no such file
+
+    def table(self, signature):
+        if signature not in self.tables:
+            path = table_path(self.directory, self.size, signature)
+            data = None
+            if os.path.exists(path):
+                with open(path, 'rb') as table_file:
+                    data = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, version, size, mover_count, opponent_count = HEADER.unpack_from(data, 0)
+                if magic != MAGIC or version != VERSION or (size, mover_count, opponent_count) != (self.size, *signature):
+                    raise ValueError(f"{path} is not a version {VERSION} table for {signature[0]}v{signature[1]}.")
+            self.tables[signature] = data
+        return self.tables[signature]
+
+    def lookup(self, signature, index):
+        data = self.table(signature)
+        if data is None:
+            return None
+        return data[HEADER.size + index // 4] >> (index % 4 * 2) & 3
+
+    def probe_masks(self, mover_mask, opponent_mask):
+        """Result for the side to move owning mover_mask, or None if no table covers the position."""
+        signature = (bin(mover_mask).count('1'), bin(opponent_mask).count('1'))
+        if self.table(signature) is None:
+            return None
+        return self.lookup(signature, table_index(mover_mask, opponent_mask, self.size * self.size, signature[1]))
+
+    def probe(self, board, color):
+        """Result for color to move on a two-color board, or None if the tablebase does not cover it."""
+        if board.rows != self.size:
+            return None
+        colors = board.get_remaining_colors()
+        if len(colors) != 2 or color not in colors:
+            return None
+        opponent = next(c for c in colors if c != color)
+        return self.probe_masks(board.color_masks[color], board.color_masks[opponent])
+
+    def best_move(self, board, color):
+        """Returns the tablebase's (start, end, is_capture) move for color, or None if it has no answer.
+
+        Winning moves are chosen with a short search for the quickest forced win,
+        since the tables store only the result and not the distance to it.
+        """
+        value = self.probe(board, color)
+        if value is None or value == INVALID:
+            return None
+        opponent = next(c for c in board.get_remaining_colors() if c != color)
+        moves = list(board.legal_moves(color))
+        if not moves:
+            return None
+        if value == WIN:
+            for depth in range(1, MAX_WIN_SEARCH + 1):
+                move = self.forced_win(board, color, opponent, depth)
+                if move is not None:
+                    return move
+
+        best_move, best_rank = moves[0], -1
+        for move in moves:
+            token = board.make_move(move)
+            winner = board.get_winner(color)
+            if winner == color:
+                rank = 3
+            elif winner is not None:
+                rank = 0
+            else:
+                reply = self.probe_masks(board.color_masks[opponent], board.color_masks[color])
+                rank = {LOSS: 2, DRAW: 1}.get(reply, 0)
+            board.unmake_move(token)
+            if rank > best_rank:
+                best_move, best_rank = move, rank
+        return best_move
+
+    def forced_win(self, board, color, opponent, depth):
+        """A move that wins for color within depth of its own moves whatever the opponent does, or None."""
+        for move in board.legal_moves(color):
+            token = board.make_move(move)
+            try:
+                winner = board.get_winner(color)
+                if winner == color:
+                    return move
+                if winner is not None or depth == 1:
+                    continue
+                if self.probe_masks(board.color_masks[opponent], board.color_masks[color]) != LOSS:
+                    continue  # Only moves the tables call winning can force a win
+                if self.wins_against_every_reply(board, color, opponent, depth - 1):
+                    return move
+            finally:
+                board.unmake_move(token)
+        return None
+
+    def wins_against_every_reply(self, board, color, opponent, depth):
+        replies = list(board.legal_moves(opponent))
+        if not replies:
+            return self.forced_win(board, color, opponent, depth) is not None  # The opponent passes
+        for reply in replies:
+            token = board.make_move(reply)
+            try:
+                winner = board.get_winner(opponent)
+                if winner != color and (winner is not None or
+                                        self.forced_win(board, color, opponent, depth) is None):
+                    return False
+            finally:
+                board.unmake_move(token)
+        return True
+
+
+def load_tablebase(directory, size=8):
+    """Opens a tablebase once per process and returns the shared Tablebase."""
+    tablebase = open_tablebases.get((directory, size))
+    if tablebase is None:
+        tablebase = open_tablebases[(directory, size)] = Tablebase(directory, size)
+    return tablebase
+
+
+def write_table(directory, size, signature, values):
+    """Packs one byte-per-position result array into a table file, four positions per byte."""
+    values = bytes(values) + bytes(-len(values) % 4)
+    packed = bytes(a | b << 2 | c << 4 | d << 6
+                   for a, b, c, d in zip(values[0::4], values[1::4], values[2::4], values[3::4]))
+    with open(table_path(directory, size, signature), 'wb') as table_file:
+        table_file.write(HEADER.pack(MAGIC, VERSION, size, *signature))
+        table_file.write(packed)
+
+
+def classify_chunk(task):
+    """Worker entry point: first pass over positions start to stop of one table in a group.
+
+    Returns the chunk's results and how many positions are still open. The open
+    positions are written to pending_path with their successors, each stored as
+    index * 2 + table number within the group, for sweep_chunk to settle.
+    """
+    size, group, table_number, start, stop, directory, pending_path = task
+    squares = size * size
+    signature = group[table_number]
+    mover_sets = colex_sets(squares, signature[0])
+    opponent_sets = colex_sets(squares, signature[1])
+    solved = load_tablebase(directory, size)  # Tables with fewer pieces, reached by captures
+    board = Board(size, initialize=False)
+    mover, opponent = TURN_ORDER[0], TURN_ORDER[1]
+
+    values = bytearray(stop - start)
+    indexes = array('Q')
+    offsets = array('Q', [0])  # Successors of the i-th open position are successors[offsets[i]:offsets[i + 1]]
+    successors = array('Q')
+    can_draws = bytearray()
+    for index in range(start, stop):
+        mover_rank, opponent_rank = divmod(index, len(opponent_sets))
+        mover_mask, opponent_mask = mover_sets[mover_rank], opponent_sets[opponent_rank]
+        if mover_mask & opponent_mask:
+            values[index - start] = INVALID
+            continue
+        set_position(board, mover, mover_mask, opponent, opponent_mask)
+        if board.is_connected(mover) or board.is_connected(opponent):
+            values[index - start] = INVALID  # The game ended before this turn
+            continue
+
+        can_draw = False
+        first_successor = len(successors)
+        moves = list(board.legal_moves(mover))
+        if not moves:
+            passed = table_index(opponent_mask, mover_mask, squares, signature[0])
+            successors.append(passed * 2 + group.index((signature[1], signature[0])))
+        for move in moves:
+            token = board.make_move(move)
+            winner = board.get_winner(mover)
+            if winner is None:
+                new_mover_mask = board.color_masks[mover]
+                new_opponent_mask = board.color_masks[opponent]
+                child = (bin(new_opponent_mask).count('1'), signature[0])
+                child_index = table_index(new_opponent_mask, new_mover_mask, squares, signature[0])
+                if child in group:
+                    successors.append(child_index * 2 + group.index(child))
+                else:
+                    reply = solved.lookup(child, child_index)
+                    if reply is None:
+                        raise FileNotFoundError(f"The {child[0]}v{child[1]} table must be solved first.")
+                    if reply == LOSS:
+                        winner = mover
+                    elif reply == DRAW:
+                        can_draw = True
+            board.unmake_move(token)
+            if winner == mover:
+                values[index - start] = WIN
+                del successors[first_successor:]
+                break
+        else:
+            if len(successors) > first_successor:
+                indexes.append(index)
+                offsets.append(len(successors))
+                can_draws.append(can_draw)
+            elif not can_draw:
+                values[index - start] = LOSS  # Every move loses at once or into a lost position
+
+    if indexes:
+        with open(pending_path, 'wb') as pending_file:
+            pickle.dump((indexes, offsets, successors, can_draws), pending_file)
+    return bytes(values), len(indexes)
+
+
+def sweep_chunk(task):
+    """Worker entry point: settles what it can of one chunk's open positions against the current results.
+
+    Returns (newly settled indexes, their results, positions still open), and
+    rewrites the chunk's pending file with only the positions still open.
+    """
+    pending_path, work_paths = task
+    with open(pending_path, 'rb') as pending_file:
+        indexes, offsets, successors, can_draws = pickle.load(pending_file)
+    tables = []
+    for path in work_paths:
+        with open(path, 'rb') as work_file:
+            tables.append(mmap.mmap(work_file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    settled = array('Q')
+    results = bytearray()
+    open_indexes, open_offsets, open_successors, open_can_draws = array('Q'), array('Q', [0]), array('Q'), bytearray()
+    for number, index in enumerate(indexes):
+        children = successors[offsets[number]:offsets[number + 1]]
+        result = None
+        all_won = not can_draws[number]  # The opponent wins after every move
+        for code in children:
+            reply = tables[code & 1][code >> 1]
+            if reply == LOSS:
+                result = WIN
+                break
+            if reply != WIN:
+                all_won = False
+        if result is None and all_won:
+            result = LOSS
+        if result is None:
+            open_indexes.append(index)
+            open_successors.extend(children)
+            open_offsets.append(len(open_successors))
+            open_can_draws.append(can_draws[number])
+        else:
+            settled.append(index)
+            results.append(result)
+    for table in tables:
+        table.close()
+
+    if settled:
+        with open(pending_path, 'wb') as pending_file:
+            pickle.dump((open_indexes, open_offsets, open_successors, open_can_draws), pending_file)
+    return settled, bytes(results), len(open_indexes)
+
+
+def solve_tables(executor, directory, size, mover_count, opponent_count, chunk_size=CHUNK_SIZE):
+    """Solves the tables of one material balance and its color-swapped twin, and returns their signatures.
+
+    A move either ends the game, captures into an already solved table with
+    fewer pieces, or leads into one of the tables solved here. The workers first
+    classify each chunk of positions by the moves that end the game or capture;
+    the open positions are then swept, one round of chunks at a time, until no
+    result changes, and whatever is still open is a draw.
+    """
+    squares = size * size
+    group = ((mover_count, opponent_count),)
+    if opponent_count != mover_count:
+        group += ((opponent_count, mover_count),)
+    values = [bytearray(table_entries(squares, signature)) for signature in group]
+
+    with tempfile.TemporaryDirectory(dir=directory) as work_directory:
+        tasks = [(size, group, table_number, start, min(start + chunk_size, len(table)), directory,
+                  os.path.join(work_directory, f"pending_{table_number}_{start}"))
+                 for table_number, table in enumerate(values) for start in range(0, len(table), chunk_size)]
+        pending = []  # (table number, pending file) of every chunk with open positions
+        for task, (chunk_values, open_count) in zip(tasks, executor.map(classify_chunk, tasks)):
+            values[task[2]][task[3]:task[4]] = chunk_values
+            if open_count:
+                pending.append((task[2], task[6]))
+
+        work_paths = [os.path.join(work_directory, f"values_{table_number}") for table_number in range(len(group))]
+        changed = True
+        while pending and changed:
+            for path, table in zip(work_paths, values):
+                with open(path, 'wb') as work_file:
+                    work_file.write(table)
+            changed = False
+            still_open = []
+            results = executor.map(sweep_chunk, [(pending_path, work_paths) for _, pending_path in pending])
+            for (table_number, pending_path), (settled, chunk_results, open_count) in zip(pending, results):
+                table = values[table_number]
+                for index, result in zip(settled, chunk_results):
+                    table[index] = result
+                changed = changed or bool(settled)
+                if open_count:
+                    still_open.append((table_number, pending_path))
+            pending = still_open
+
+    for signature, table in zip(group, values):
+        write_table(directory, size, signature, table)
+    return group
+
+
+def generate(directory, size=8, max_pieces=4, jobs=None, chunk_size=CHUNK_SIZE):
+    """Solves every material balance with at least two pieces a side, up to max_pieces in total.
+
+    Each table is split into chunks of chunk_size positions shared out among the workers.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for total in range(4, max_pieces + 1):
+            for mover_count in range(2, total // 2 + 1):
+                yield solve_tables(executor, directory, size, mover_count, total - mover_count, chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate win/loss/draw tables for 2-player endgames.")
+    parser.add_argument('--directory', default='tablebase', help="Where to write the table files")
+    parser.add_argument('--size', type=int, default=8, help="Board size")
+    parser.add_argument('--max-pieces', type=int, default=4, help="Largest total number of pieces to solve")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Positions per worker task")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for signatures in generate(args.directory, args.size, args.max_pieces, args.jobs, args.chunk_size):
+        print(f"Solved {', '.join(f'{mover}v{opponent}' for mover, opponent in signatures)} "
+              f"after {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
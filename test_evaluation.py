@@ -0,0 +1,50 @@
+import random
+import pytest
+from board import Board, TURN_ORDER
+from evaluation import board_features, evaluate_batch, evaluate_board, features_batch, positions_to_grids
+
+
+def random_boards(size, count, seed):
+    """Boards reached by random legal moves from the starting position, some of them near the end of a game."""
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        board = Board(size)
+        colors = [color for color in TURN_ORDER if color in board.get_remaining_colors()]
+        for ply in range(rng.randrange(80)):
+            moves = list(board.legal_moves(colors[ply % len(colors)]))
+            if not moves or board.get_winner() is not None:
+                break
+            board.make_move(rng.choice(moves)[:2])
+        boards.append(board)
+    return boards
+
+
+@pytest.mark.parametrize('size', [8, 12, 16])
+def test_batch_features_match_board(size):
+    boards = random_boards(size, 20, seed=size)
+    grids = positions_to_grids([board.to_position() for board in boards])
+    for color_index, color in enumerate(TURN_ORDER):
+        batch = features_batch(grids, color_index)
+        for number, board in enumerate(boards):
+            if not board.color_masks.get(color, 0):
+                continue
+            assert batch['mobility'][number] == len(list(board.legal_moves(color)))
+            assert batch['components'][number] == board.count_components(color)
+            for name, value in board_features(board, color).items():
+                assert batch[name][number] == pytest.approx(value), name
+
+
+@pytest.mark.parametrize('size', [8, 12, 16])
+def test_evaluate_board_matches_batch(size):
+    boards = random_boards(size, 10, seed=size + 1)
+    scores = evaluate_batch([board.to_position() for board in boards], 0)
+    for board, score in zip(boards, scores):
+        colors = [color for color in TURN_ORDER if color in board.get_remaining_colors()]
+        assert evaluate_board(board, TURN_ORDER[0], colors) == pytest.approx(score)
+
+
+def test_mobility_can_be_left_out():
+    board = Board(8)
+    assert board_features(board, TURN_ORDER[0], mobility=False)['mobility'] == 0
+    assert board_features(board, TURN_ORDER[0])['mobility'] == len(list(board.legal_moves(TURN_ORDER[0])))
@@ -0,0 +1,64 @@
+import os
+import pytest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+pygame = pytest.importorskip('pygame')
+pytest.importorskip('HumanPlayer')
+from game import Game  # noqa: E402
+
+BLACK, WHITE = (0, 0, 0), (255, 255, 255)
+
+
+@pytest.fixture
+def game():
+    pygame.init()
+    window = pygame.display.set_mode((800, 800))
+    yield Game(window, 2, ["Human", "Computer"], board_size=8, player_color=BLACK, computer_color=WHITE,
+               async_ai=False)
+    pygame.quit()
+
+
+def test_mover_wins_when_both_sides_connect(game, monkeypatch):
+    winners = []
+    monkeypatch.setattr(game, 'display_winner', winners.append)
+    game.board.clear_board()
+    for row, col in ((0, 0), (1, 1), (5, 5)):
+        game.board.set_piece(row, col, BLACK)
+    for row, col in ((5, 3), (6, 4)):
+        game.board.set_piece(row, col, WHITE)
+
+    # White captures Black's stray piece, which leaves both colors in one group
+    game.current_turn = 1
+    game.play_move((5, 3), (5, 5))
+    game.check_winner()
+    assert winners == [WHITE]
+    assert game.board.get_winner(WHITE) == WHITE
+
+
+@pytest.mark.parametrize('text, message', [
+    ("B . X\n. . .\n. . W\n", "unknown piece symbol"),
+    ("B .\n. W\n\nMove History:\n", "does not say whose turn it is"),
+])
+def test_bad_saved_game_raises_before_changing_the_game(game, tmp_path, text, message):
+    path = tmp_path / "game_case_bad.txt"
+    path.write_text(text)
+    board = game.board
+    with pytest.raises(ValueError, match=message):
+        game.load_game_state(str(path))
+    assert game.board is board and len(game.players) == 2
+
+    with pytest.raises(ValueError, match=message):
+        Game(game.window, 2, ["Human", "Computer"], board_size=8, case=str(path), async_ai=False)
+
+
+def test_missing_case_file_raises(game, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        game.load_game_state(99)
+
+
+def test_loads_game_case_file(game, tmp_path):
+    path = tmp_path / "game_case_1.txt"
+    path.write_text(". B . .\nW . . W\n. . . .\n. B . .\nNext Player: Computer\nNext Color: White\n")
+    game.load_game_state(str(path))
+    assert (game.board.rows, game.computer_color, game.current_turn) == (4, WHITE, 1)
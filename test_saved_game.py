@@ -0,0 +1,98 @@
+import pytest
+from board import Board, TURN_ORDER
+from saved_game import (NAME_COLORS, SavedGame, build_board, color_to_move, format_saved_game, load_directory,
+                        parse_saved_game, player_colors, save_saved_game)
+
+BLACK, WHITE, RED, GREEN = (NAME_COLORS[name] for name in ('Black', 'White', 'Red', 'Green'))
+
+
+def start_pieces(size):
+    board = Board(size)
+    return tuple((piece.row, piece.col, piece.color) for piece in board.pieces)
+
+
+def test_two_player_round_trip():
+    saved = SavedGame(8, start_pieces(8), (BLACK, WHITE), [(1, BLACK, (0, 1), (2, 1)), (2, WHITE, None, None)],
+                      0, None, None)
+    text = format_saved_game(saved)
+    parsed = parse_saved_game(text)
+    assert set(parsed.pieces) == set(saved.pieces)
+    assert parsed._replace(pieces=saved.pieces) == saved
+    assert format_saved_game(parsed) == text
+    assert color_to_move(parsed) == BLACK
+
+
+def test_four_player_round_trip():
+    moves = [(1, BLACK, (0, 1), (2, 1)), (2, WHITE, (1, 0), (1, 2)), (3, RED, None, None)]
+    saved = SavedGame(12, start_pieces(12), (BLACK, WHITE, RED, GREEN), moves, 3, None, None)
+    parsed = parse_saved_game(format_saved_game(saved))
+    assert parsed.player_colors == (BLACK, WHITE, RED, GREEN)
+    assert parsed.moves == moves
+    assert color_to_move(parsed) == GREEN
+    assert {(row, col, color) for row, col, color in parsed.pieces} == set(saved.pieces)
+    assert build_board(parsed).color_masks == Board(12).color_masks
+
+
+def test_game_case_file():
+    text = "\n".join([
+        ". B . .",
+        "W . . W",
+        ". . . .",
+        ". B . .",
+        "Next Player: Computer",
+        "Next Color: White",
+    ])
+    parsed = parse_saved_game(text)
+    assert parsed.board_size == 4
+    assert set(parsed.pieces) == {(0, 1, BLACK), (1, 0, WHITE), (1, 3, WHITE), (3, 1, BLACK)}
+    assert (parsed.next_player, parsed.next_color) == ('Computer', WHITE)
+    assert parsed.player_colors == () and parsed.current_turn is None
+    assert color_to_move(parsed) == WHITE
+
+
+def test_old_four_player_save_without_players_section():
+    # Four-player saves used to have no Players: section, only the move history and whose turn it is
+    old_save = SavedGame(12, start_pieces(12), (), [(1, BLACK, (0, 1), (2, 1)), (2, WHITE, (1, 0), (1, 2))],
+                         2, None, None)
+    parsed = parse_saved_game(format_saved_game(old_save))
+    assert parsed.player_colors == ()
+    assert player_colors(parsed) == (BLACK, WHITE, RED, GREEN)
+    assert color_to_move(parsed) == RED
+
+    no_moves = parsed._replace(moves=[], current_turn=0)
+    assert player_colors(no_moves) == tuple(TURN_ORDER)
+
+
+@pytest.mark.parametrize('text, message', [
+    ("", "no board found"),
+    ("B . X\n. . .\n. . W\n", "unknown piece symbol"),
+    ("B . .\n. .\n. . W\n", "row has 2 squares"),
+    ("B . .\n. . W\n", "must be square"),
+    ("B .\n. W\n\nMove History:\nPlayer 1 (Black) jumped A2 to B1\n", "unrecognized move"),
+    ("B .\n. W\n\nMove History:\nPlayer 1 (Black) moved A2 to C9\n", "leaves the board"),
+    ("B .\n. W\n\nPlayers:\nPlayer 1 Color: Purple\n", "unknown color"),
+    ("B .\n. W\n\nPlayers:\nPlayer 1 Color: Black\nPlayer 2 Color: Black\n", "same color"),
+    ("B .\n. W\n\nPlayers:\nPlayer 1 Color: Black\nPlayer 3 Color: White\n", "numbered 1 to 2"),
+    ("B .\n. W\n\nPlayers:\nPlayer 1 Color: Black\nPlayer 2 Color: White\n\nCurrent Turn: Player 3\n",
+     "there are 2 players"),
+    ("B .\n. W\n\nSomething else\n", "unexpected line"),
+])
+def test_rejected_inputs(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse_saved_game(text, 'case.txt')
+
+
+def test_load_directory(tmp_path, caplog):
+    saved = SavedGame(8, start_pieces(8), (BLACK, WHITE), [], 1, None, None)
+    for number in (10, 2, 1):
+        save_saved_game(tmp_path / f"game_case_{number}.txt", saved)
+    (tmp_path / "game_case_5.txt").write_text("not a board\n")
+    (tmp_path / "notes.txt").write_text("B W\n")
+
+    with pytest.raises(ValueError, match="game_case_5.txt"):
+        load_directory(str(tmp_path))
+
+    loaded = load_directory(str(tmp_path), skip_invalid=True)
+    assert [path.rsplit('/', 1)[1] for path in loaded] == ["game_case_1.txt", "game_case_2.txt", "game_case_10.txt"]
+    assert all(color_to_move(game) == WHITE for game in loaded.values())
+    assert "game_case_5.txt" in caplog.text
@@ -0,0 +1,156 @@
+import argparse
+import ast
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from game_record import append_games, encode_game, record_from_result
+from headless import run_game, PLAYERS_FOR_SIZE
+from log_config import configure_logging, add_log_level_argument
+
+
+def parse_player(spec):
+    """Turns "alphabeta,search_depth=2,book_path=book.bin" into ComputerPlayer keyword arguments.
+
+    Values are read as Python literals (numbers, True, False, None), anything else as a string.
+    """
+    engine, *options = spec.split(',')
+    settings = {'engine': engine}
+    for option in options:
+        key, separator, value = option.partition('=')
+        if not separator or not key:
+            raise ValueError(f"Option {option!r} in player {spec!r} is not of the form name=value.")
+        try:
+            settings[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            settings[key] = value
+    return settings
+
+
+def seatings(players, seats, mode):
+    """Yields tuples of player names, one per seat in turn order."""
+    if mode == 'gauntlet':
+        # The first player faces each other player alone, once from every seat
+        challenger = players[0]
+        for opponent in players[1:]:
+            for seat in range(seats):
+                yield tuple(challenger if i == seat else opponent for i in range(seats))
+    elif len(players) >= seats:
+        yield from itertools.permutations(players, seats)
+    else:
+        for seating in itertools.product(players, repeat=seats):
+            if len(set(seating)) > 1:
+                yield seating
+
+
+def play_game(task):
+    """Worker entry point: plays one game and returns only what the aggregate needs."""
+    board_size, seating, settings, seed = task
+    result = run_game(board_size, [settings[name] for name in seating], seed=seed)
+    return {
+        'board_size': board_size,
+        'seating': seating,
+        'seed': seed,
+        'winner_seat': result['winner_index'],
+        'moves': len(result['moves']),
+        'elapsed': result['elapsed'],
+        'record': encode_game(record_from_result(result)),  # A few bytes per move, for --archive
+    }
+
+
+def wilson_interval(wins, games, z=1.96):
+    """95% Wilson score interval for a win rate."""
+    if games == 0:
+        return 0.0, 0.0
+    rate = wins / games
+    denominator = 1 + z * z / games
+    centre = (rate + z * z / (2 * games)) / denominator
+    half_width = z * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games)) / denominator
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+
+def summarize(results, players):
+    """Aggregates game results into win, draw and loss counts with intervals per board size and player.
+
+    Counts are per game, not per seat, so the interval's sample size is the number of games played.
+    """
+    summary = {}
+    for result in results:
+        size_summary = summary.setdefault(result['board_size'], {
+            name: {'games': 0, 'wins': 0, 'draws': 0, 'losses': 0} for name in players})
+        winner_seat = result['winner_seat']
+        winner = result['seating'][winner_seat] if winner_seat is not None else None
+        # A configuration holding several seats plays the game once, and wins it if any of its seats won
+        for name in set(result['seating']):
+            stats = size_summary[name]
+            stats['games'] += 1
+            if winner_seat is None:
+                stats['draws'] += 1
+            elif winner == name:
+                stats['wins'] += 1
+            else:
+                stats['losses'] += 1
+    for size_summary in summary.values():
+        for stats in size_summary.values():
+            stats['win_rate'] = stats['wins'] / stats['games'] if stats['games'] else 0.0
+            stats['interval'] = wilson_interval(stats['wins'], stats['games'])
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play batches of computer-vs-computer games across all cores.")
+    parser.add_argument('--player', action='append', required=True,
+                        help="Player configuration such as 'random' or 'alphabeta,search_depth=2'; repeat per player")
+    parser.add_argument('--mode', choices=['round-robin', 'gauntlet'], default='round-robin',
+                        help="Gauntlet plays the first player against each of the others")
+    parser.add_argument('--sizes', type=int, nargs='+', choices=sorted(PLAYERS_FOR_SIZE), default=[8])
+    parser.add_argument('--games', type=int, default=10, help="Games per seating")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the first game; each game gets its own")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument('--json', help="Also write the summary to this file")
+    parser.add_argument('--archive', help="Append every game to this binary game archive")
+    add_log_level_argument(parser)
+    args = parser.parse_args()
+    configure_logging(args.log_level)
+
+    try:
+        settings = {spec: parse_player(spec) for spec in args.player}
+    except ValueError as error:
+        parser.error(str(error))
+    players = list(settings)
+    if len(players) < 2:
+        parser.error("A tournament needs at least two --player configurations.")
+
+    tasks = []
+    for board_size in args.sizes:
+        for seating in seatings(players, PLAYERS_FOR_SIZE[board_size], args.mode):
+            for _ in range(args.games):
+                tasks.append((board_size, seating, settings, args.seed + len(tasks)))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=configure_logging,
+                             initargs=(args.log_level,)) as executor:
+        results = list(executor.map(play_game, tasks, chunksize=max(1, len(tasks) // (args.jobs * 4))))
+    elapsed = time.perf_counter() - start
+
+    if args.archive:
+        append_games(args.archive, (result['record'] for result in results))
+
+    summary = summarize(results, players)
+    print(f"Played {len(results)} games in {elapsed:.1f}s on {args.jobs} processes")
+    for board_size, size_summary in summary.items():
+        print(f"\n{board_size}x{board_size} ({PLAYERS_FOR_SIZE[board_size]} players)")
+        for name, stats in size_summary.items():
+            low, high = stats['interval']
+            print(f"  {name:40} {stats['wins']:5}W {stats['draws']:5}D {stats['losses']:5}L  "
+                  f"win rate {stats['win_rate']:.3f} [{low:.3f}, {high:.3f}]")
+
+    if args.json:
+        with open(args.json, 'w') as json_file:
+            json.dump({str(size): size_summary for size, size_summary in summary.items()}, json_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
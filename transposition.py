@@ -0,0 +1,44 @@
+# Kinds of score stored for a position
+EXACT = 0
+LOWER_BOUND = 1  # The search failed high; the true score is at least this
+UPPER_BOUND = 2  # The search failed low; the true score is at most this
+
+
+class TranspositionTable:
+    """Fixed-size table of search results indexed by Zobrist key.
+
+    Each slot holds one (key, depth, score, flag, best_move, generation) entry,
+    so memory never grows past the size chosen at construction. A new result
+    replaces the slot when it is empty, holds the same position, is left over
+    from an earlier search, or was searched no deeper than the new result.
+    """
+
+    def __init__(self, size=1 << 16):
+        if size <= 0 or size & (size - 1):
+            raise ValueError("Transposition table size must be a power of two.")
+        self.size = size
+        self.index_mask = size - 1
+        self.entries = [None] * size
+        self.generation = 0
+
+    def new_search(self):
+        """Marks existing entries as stale so the next search may overwrite them first."""
+        self.generation = (self.generation + 1) & 0xFF
+
+    def probe(self, key):
+        """Returns the entry stored for key, or None if the slot holds another position."""
+        entry = self.entries[key & self.index_mask]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, score, flag, best_move):
+        index = key & self.index_mask
+        existing = self.entries[index]
+        if (existing is None or existing[0] == key or existing[5] != self.generation
+                or depth >= existing[1]):
+            self.entries[index] = (key, depth, score, flag, best_move, self.generation)
+
+    def clear(self):
+        self.entries = [None] * self.size
+        self.generation = 0